@@ -1,16 +1,33 @@
 import os
 import sys
 import logging
+import hashlib
+import threading
+import time
+import importlib
 import mimetypes
-from datetime import datetime
-from flask import Flask, send_from_directory, abort, render_template, jsonify, request, redirect
-from concurrent.futures import ThreadPoolExecutor
+import contextlib
+from datetime import datetime, timezone
+from urllib.parse import quote
+import click
+from flask import Flask, abort, render_template, jsonify, request, redirect
 from werkzeug.exceptions import HTTPException
+from werkzeug.http import is_resource_modified
+from werkzeug.wsgi import wrap_file
 from flask_jwt_extended import JWTManager
 from sqlalchemy import text
 
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
 # Import Flask extensions
 from app.models import db, bcrypt
+from common.concurrency import release_pending_report_slots
+from common.executor import BoundedThreadPoolExecutor
+from common.jwt_session import revocation_cache, is_access_token_revoked
+from common.security import safe_path_join
 
 # App config constants (ensure config.py exists)
 from config import BASE_DIR, GENERATED_DIR, UPLOADS_DIR, JOBS_DIR
@@ -23,137 +40,526 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Try importing blueprints; if any import fails we log and continue so the app still starts.
-hvac_mep_bp = None
-civil_bp = None
-cleaning_bp = None
-auth_bp = None
-bd_bp = None
-docs_bp = None
 
-try:
-    from module_hvac_mep.routes import hvac_mep_bp  # noqa: F401
-    logger.info("Imported module_hvac_mep.routes.hvac_mep_bp")
-except Exception as e:
-    logger.exception("Could not import module_hvac_mep.routes.hvac_mep_bp: %s", e)
-    hvac_mep_bp = None
+def _load_blueprint(module_path, attr):
+    """
+    Import a blueprint on demand. Blueprint modules pull in heavy dependencies
+    (models, PDF/Excel libraries, Cloudinary), so they are only imported when
+    create_app() registers them, not when this module is imported.
+    If the module (or one of its dependencies) is not importable we log and return None so
+    the app still starts with a placeholder route. Any other error raised while the module
+    loads is a bug and propagates: the worker fails to boot instead of serving a broken app.
+    """
+    try:
+        module = importlib.import_module(module_path)
+    except ImportError as e:
+        logger.warning("Blueprint %s.%s not importable: %s", module_path, attr, e)
+        return None
+    bp = getattr(module, attr)
+    logger.info("Imported %s.%s", module_path, attr)
+    return bp
 
-try:
-    from module_civil.routes import civil_bp  # noqa: F401
-    logger.info("Imported module_civil.routes.civil_bp")
-except Exception as e:
-    logger.exception("Could not import module_civil.routes.civil_bp: %s", e)
-    civil_bp = None
 
-try:
-    from module_cleaning.routes import cleaning_bp  # noqa: F401
-    logger.info("Imported module_cleaning.routes.cleaning_bp")
-except Exception as e:
-    logger.exception("Could not import module_cleaning.routes.cleaning_bp: %s", e)
-    cleaning_bp = None
+def _ensure_dirs(*paths):
+    """Create missing directories; one stat per path when they already exist (every boot after the first)"""
+    for path in paths:
+        if not os.path.isdir(path):
+            os.makedirs(path, exist_ok=True)
 
-try:
-    from app.auth.routes import auth_bp  # noqa: F401
-    logger.info("Imported app.auth.routes.auth_bp")
-except Exception as e:
-    logger.exception("Could not import app.auth.routes.auth_bp: %s", e)
-    auth_bp = None
 
-try:
-    from app.admin.routes import admin_bp  # noqa: F401
-    logger.info("Imported app.admin.routes.admin_bp")
-except Exception as e:
-    logger.exception("Could not import app.admin.routes.admin_bp: %s", e)
-    admin_bp = None
+# Login page route, registered in create_app. Redirects to it build the URL from this constant
+# (plus the script root) instead of a url_for() lookup on every auth failure.
+LOGIN_PATH = '/login'
 
-try:
-    from app.workflow.routes import workflow_bp  # noqa: F401
-    logger.info("Imported app.workflow.routes.workflow_bp")
-except Exception as e:
-    logger.exception("Could not import app.workflow.routes.workflow_bp: %s", e)
-    workflow_bp = None
+# /api/ routes that render HTML pages: auth failures there redirect to login instead of returning JSON
+PAGE_RENDER_ROUTES = frozenset({'/api/workflow/history', '/api/workflow/pending-reviews'})
 
-try:
-    from app.bd.routes import bd_bp  # noqa: F401
-    logger.info("Imported app.bd.routes.bd_bp")
-except Exception as e:
-    logger.exception("Could not import app.bd.routes.bd_bp: %s", e)
-    bd_bp = None
+def _is_api(path):
+    """True for JWT-protected JSON APIs: /api/... and module APIs such as /admin/mmr/api/..."""
+    return '/api/' in path
 
-try:
-    from app.docs.routes import docs_bp  # noqa: F401
-    logger.info("Imported app.docs.routes.docs_bp")
-except Exception as e:
-    logger.exception("Could not import app.docs.routes.docs_bp: %s", e)
-    docs_bp = None
 
-# HR Module
-hr_bp = None
-try:
-    from module_hr.routes import hr_bp  # noqa: F401
-    logger.info("Imported module_hr.routes.hr_bp")
-except Exception as e:
-    logger.exception("Could not import module_hr.routes.hr_bp: %s", e)
-    hr_bp = None
+def _wants_json():
+    """
+    Error responses as JSON: /api/ paths, or a JSON request body (Content-Type check, no
+    Accept parsing). Anchored rather than _is_api, so an unmatched URL that merely contains
+    /api/ (e.g. /static/docs/api/x) still gets the HTML page.
+    """
+    return request.path.startswith('/api/') or request.is_json
 
-# Procurement Module
-procurement_module_bp = None
-try:
-    from module_procurement.routes import procurement_bp as procurement_module_bp  # noqa: F401
-    logger.info("Imported module_procurement.routes.procurement_bp")
-except Exception as e:
-    logger.exception("Could not import module_procurement.routes.procurement_bp: %s", e)
-    procurement_module_bp = None
 
-# Inspection Form Module (HVAC, Civil, Cleaning)
-inspection_bp = None
-try:
-    from module_inspection.routes import inspection_bp  # noqa: F401
-    logger.info("Imported module_inspection.routes.inspection_bp")
-except Exception as e:
-    logger.exception("Could not import module_inspection.routes.inspection_bp: %s", e)
-    inspection_bp = None
+def _auth_failure(error):
+    """
+    Response for a missing/invalid/expired JWT: JSON 401 for API calls, redirect to
+    login for HTML pages (including the /api/ routes that render pages).
+    """
+    path = request.path
+    if path not in PAGE_RENDER_ROUTES and _is_api(path):
+        return jsonify({"success": False, "error": error}), 401
+    return redirect(request.script_root + LOGIN_PATH), 302
+
+
+# Columns added after the first deploys, per table: create_all() never alters existing tables
+ADDED_COLUMNS = {
+    'users': [
+        ('designation', 'VARCHAR(20) DEFAULT NULL'),
+    ],
+    'submissions': [
+        ('workflow_status', "VARCHAR(30) DEFAULT 'submitted'"),
+        ('supervisor_id', 'INTEGER'),
+        ('manager_id', 'INTEGER'),
+        ('supervisor_notified_at', 'TIMESTAMP DEFAULT NULL'),
+        ('supervisor_reviewed_at', 'TIMESTAMP DEFAULT NULL'),
+        ('manager_notified_at', 'TIMESTAMP DEFAULT NULL'),
+        ('manager_reviewed_at', 'TIMESTAMP DEFAULT NULL'),
+    ],
+    'dochub_documents': [
+        ('doc_type', "VARCHAR(20) DEFAULT 'upload'"),
+        ('content', 'TEXT'),
+        # PostgreSQL rejects BOOLEAN DEFAULT 0; use FALSE (SQLite accepts FALSE too)
+        ('inline_asset', 'BOOLEAN DEFAULT FALSE'),
+        ('reference_attachments', 'TEXT'),
+    ],
+}
+
+
+def _existing_columns():
+    """
+    {table: {column names}} for the ADDED_COLUMNS tables that exist. PostgreSQL answers
+    in one information_schema query; other databases go through the SQLAlchemy inspector.
+    """
+    from sqlalchemy import inspect
+
+    tables = list(ADDED_COLUMNS)
+    if db.engine.dialect.name == 'postgresql':
+        with db.engine.connect() as conn:
+            rows = conn.execute(
+                text("SELECT table_name, column_name FROM information_schema.columns "
+                     "WHERE table_schema = current_schema() AND table_name = ANY(:tables)"),
+                {'tables': tables},
+            ).all()
+        existing = {}
+        for table, column in rows:
+            existing.setdefault(table, set()).add(column)
+        return existing
+
+    inspector = inspect(db.engine)
+    table_names = set(inspector.get_table_names())
+    return {
+        table: {col['name'] for col in inspector.get_columns(table)}
+        for table in tables if table in table_names
+    }
+
+
+def _add_missing_columns():
+    """
+    Add any ADDED_COLUMNS missing from existing tables; only the missing ones are altered.
+    PostgreSQL gets one multi-clause ALTER TABLE per table (one lock, one round trip);
+    SQLite only accepts one ADD COLUMN per statement, so it gets one each.
+    """
+    current = _existing_columns()
+    is_postgres = db.engine.dialect.name == 'postgresql'
+    for table, wanted in ADDED_COLUMNS.items():
+        if table not in current:
+            continue
+        missing = [(name, ddl) for name, ddl in wanted if name not in current[table]]
+        if not missing:
+            continue
+
+        logger.info(f"Adding missing columns to {table} table: {[name for name, _ in missing]}")
+        if is_postgres:
+            clauses = ", ".join(f"ADD COLUMN IF NOT EXISTS {name} {ddl}" for name, ddl in missing)
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table} {clauses}"))
+                logger.info(f"✅ Added {len(missing)} column(s) to {table} table")
+            except Exception as e:
+                logger.warning(f"Could not add missing columns to {table} (non-critical): {e}")
+            continue
+
+        for name, ddl in missing:
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+                logger.info(f"✅ Added {name} column to {table} table")
+            except Exception as col_error:
+                error_str = str(col_error).lower()
+                if 'already exists' in error_str or 'duplicate' in error_str:
+                    logger.info(f"Column {name} already exists, skipping")
+                else:
+                    logger.warning(f"Could not add {name}: {col_error}")
+
+
+def _all_tables_exist():
+    """
+    True when every model table already exists. PostgreSQL answers in one to_regclass
+    query instead of create_all()'s per-table lookups; other databases list their tables
+    through the SQLAlchemy inspector. A failed probe counts as "missing".
+    """
+    from sqlalchemy import inspect
+
+    names = [table.name for table in db.metadata.sorted_tables]
+    try:
+        if db.engine.dialect.name != 'postgresql':
+            return set(names) <= set(inspect(db.engine).get_table_names())
+        with db.engine.connect() as conn:
+            missing = conn.execute(
+                text("SELECT count(*) FROM unnest(CAST(:names AS text[])) AS t(name) "
+                     "WHERE to_regclass(quote_ident(t.name)) IS NULL"),
+                {'names': names},
+            ).scalar()
+    except Exception as e:
+        logger.warning(f"Table existence probe failed, falling back to create_all: {e}")
+        return False
+    return missing == 0
+
+
+def _ensure_schema():
+    """Create missing tables and add missing ADDED_COLUMNS (idempotent)"""
+    # Step 1: Create all tables if they don't exist (fully automatic)
+    logger.info("Ensuring all database tables exist...")
+    if _all_tables_exist():
+        logger.info("✅ All database tables exist")
+    else:
+        try:
+            db.create_all()
+            logger.info("✅ All database tables verified/created")
+        except Exception as create_error:
+            logger.warning(f"Table creation check: {create_error}")
+            # Continue anyway - tables might already exist
+
+    # Step 2: Database migrations are now handled by Flask-Migrate
+    # Run migrations manually using: flask db upgrade
+    # This ensures version-controlled, reversible migrations
+    logger.info("✅ Database tables verified. Use 'flask db upgrade' to apply migrations.")
 
-# MMR (Report Generation) Module
-mmr_bp = None
+    # Step 2.5: Add missing columns if tables exist (one-time migration for existing databases)
+    _add_missing_columns()
+
+
+def _migrate_schema(database_url, force=False):
+    """
+    _ensure_schema(), skipped (unless force) when this database was already brought up to
+    date for the current models (schema fingerprint file) and its tables are still there.
+    The file lives outside the database, so a database dropped or recreated under an
+    unchanged fingerprint is caught by the table probe and rebuilt.
+    """
+    fp_path = _schema_fingerprint_path(database_url)
+    with _schema_lock(fp_path):
+        fingerprint = _schema_fingerprint()
+        if not force and fp_path and _read_fingerprint(fp_path) == fingerprint:
+            if _all_tables_exist():
+                logger.info("✅ Schema unchanged since last startup - skipping table/column checks")
+                return
+            logger.warning("⚠️  Schema fingerprint found but tables are missing (database recreated?) - rebuilding")
+        _ensure_schema()
+        if fp_path:
+            _write_fingerprint(fp_path, fingerprint)
+
+
+def _schema_fingerprint():
+    """Hash of the schema the code expects (model tables/columns/types + ADDED_COLUMNS); no DB access"""
+    tables = sorted(
+        (table.name, tuple((col.name, repr(col.type)) for col in table.columns))
+        for table in db.metadata.sorted_tables
+    )
+    payload = repr((tables, sorted(ADDED_COLUMNS.items())))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _schema_fingerprint_path(database_url):
+    """
+    Per-database fingerprint file in GENERATED_DIR, or None when the database does not
+    outlive the process (in-memory SQLite) and must always be created.
+    """
+    from sqlalchemy.engine import make_url
+
+    url = make_url(database_url)
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return None
+    url_hash = hashlib.sha256(database_url.encode()).hexdigest()[:16]
+    return os.path.join(GENERATED_DIR, f'.schema-{url_hash}')
+
+
+def _read_fingerprint(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _write_fingerprint(path, fingerprint):
+    try:
+        with open(path, 'w') as f:
+            f.write(fingerprint)
+    except OSError as e:
+        logger.warning(f"Could not save schema fingerprint (checks will run next startup): {e}")
+
+
+@contextlib.contextmanager
+def _schema_lock(path):
+    """
+    Serialize schema checks across workers booting together: the first runs them, the
+    others wait and then find the fingerprint up to date. No-op without fcntl (Windows).
+    """
+    if not path or fcntl is None:
+        yield
+        return
+    try:
+        lock_file = open(path + '.lock', 'w')
+    except OSError:
+        yield
+        return
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _ensure_admin_user():
+    """Create the default 'admin' user if it does not exist (password from DEFAULT_ADMIN_PASSWORD or generated)"""
+    try:
+        from app.models import User
+        admin = User.query.filter_by(username='admin').first()
+        if not admin:
+            logger.info("Creating default admin user...")
+            admin = User(
+                username='admin',
+                email='admin@injaaz.com',
+                full_name='System Administrator',
+                role='admin',
+                is_active=True,
+                access_hvac=True,
+                access_civil=True,
+                access_cleaning=True
+            )
+            # Use environment variable for default password, or generate random one
+            import secrets
+            default_password = os.environ.get('DEFAULT_ADMIN_PASSWORD', None)
+            if not default_password:
+                # Generate a secure random password if not set
+                default_password = secrets.token_urlsafe(16)
+                logger.warning("⚠️  No DEFAULT_ADMIN_PASSWORD set - using generated password")
+                # Log to a secure location (not just console)
+                logger.critical(f"🔐 DEFAULT ADMIN PASSWORD GENERATED: {default_password}")
+                logger.critical("⚠️  SECURITY: Change this password immediately after first login!")
+            
+            admin.set_password(default_password)
+            admin.password_changed = False  # Force password change on first login
+            db.session.add(admin)
+            db.session.commit()
+            logger.info("✅ Default admin user created")
+            if not os.environ.get('DEFAULT_ADMIN_PASSWORD'):
+                logger.critical(f"⚠️  CRITICAL: Default admin password is: {default_password}")
+                logger.critical("⚠️  This password will be required on first login. CHANGE IT IMMEDIATELY!")
+            else:
+                logger.warning("⚠️  Default admin password set from DEFAULT_ADMIN_PASSWORD env var")
+                logger.warning("⚠️  Password change will be required on first login")
+        else:
+            logger.info("✅ Admin user already exists")
+    except Exception as admin_create_error:
+        logger.warning(f"Could not create admin user (non-critical): {admin_create_error}")
+
+
+def _seed_dochub_samples():
+    """Add the sample DocHub documents to an empty DocHub (authored by the first admin)"""
+    try:
+        from app.models import DocHubDocument, User
+        if DocHubDocument.query.count() == 0:
+            admin_user = User.query.filter_by(role='admin').first()
+            author_id = admin_user.id if admin_user else None
+            samples = [
+                ('Employee Onboarding Guide', 'onboarding', 'published',
+                 '<h1>Employee Onboarding Guide</h1>'
+                 '<div class="callout callout-blue"><span class="callout-icon">👋</span><div><strong>Welcome to the team!</strong> This guide will help you get up and running quickly.</div></div>'
+                 '<h2>1. Company Overview</h2><p>Injaaz Facilities Management delivers excellence in facility services across the UAE.</p>'
+                 '<h2>2. Your First Week</h2><ul><li><strong>Day 1:</strong> Meet your team lead, set up workstation</li>'
+                 '<li><strong>Day 2:</strong> System access, security training</li><li><strong>Day 3-5:</strong> Department walkthroughs</li></ul>'
+                 '<h2>3. Key Contacts</h2><ul><li><strong>HR:</strong> arshith@injaaz.ae</li><li><strong>IT:</strong> +971 50 156 0277</li></ul>'),
+                ('Project Services Agreement Template', 'contracts', 'review',
+                 '<h1>Project Services Agreement</h1><p><em>Agreement between Service Provider and Client.</em></p>'
+                 '<h2>1. Parties</h2><p><strong>Service Provider:</strong> Injaaz FM.<br/><strong>Client:</strong> [Client Name].</p>'
+                 '<h2>2. Scope</h2><ul><li>Facility management services</li><li>Maintenance and repairs</li><li>Cleaning and HVAC</li></ul>'
+                 '<h2>3. Payment Terms</h2><p>As per agreed milestones.</p>'),
+                ('Remote Work Policy', 'policies', 'published',
+                 '<h1>Remote Work Policy</h1><div class="callout"><span class="callout-icon">⚠️</span><div>Effective January 2025.</div></div>'
+                 '<h2>1. Purpose</h2><p>Guidelines for remote work to ensure productivity and security.</p>'
+                 '<h2>2. Eligibility</h2><p>Available after 90-day probation.</p>'
+                 '<h2>3. Core Hours</h2><p>10:00 AM – 3:00 PM local time.</p>'),
+                ('DocHub User Manual', 'manuals', 'published',
+                 '<h1>DocHub User Manual</h1><p><em>Version 1.0 — March 2025</em></p>'
+                 '<h2>1. Getting Started</h2><p>DocHub is your document management platform.</p>'
+                 '<h2>2. Creating Documents</h2><ol><li>Click + New Document</li><li>Select a template</li><li>Edit and Save</li></ol>'
+                 '<h2>3. Shortcuts</h2><p><strong>Ctrl+S</strong> — Save. <strong>Ctrl+B</strong> — Bold.</p>'),
+                ('Q1 2025 Performance Report', 'reports', 'draft',
+                 '<h1>Q1 2025 Performance Report</h1><p><em>Analytics Team — April 2025</em></p>'
+                 '<div class="callout callout-green"><span class="callout-icon">📈</span><div>Strong quarter across key metrics.</div></div>'
+                 '<h2>1. Executive Summary</h2><p>Q1 marked a solid start to the fiscal year.</p>'
+                 '<h2>2. Key Metrics</h2><table><tr><th>Metric</th><th>Target</th><th>Actual</th></tr>'
+                 '<tr><td>Revenue</td><td>—</td><td>—</td></tr><tr><td>Projects</td><td>—</td><td>—</td></tr></table>'),
+            ]
+            for title, cat, status, content in samples:
+                doc = DocHubDocument(
+                    title=title,
+                    filename='',
+                    stored_path='',
+                    file_type='',
+                    doc_type='content',
+                    content=content,
+                    category=cat,
+                    status=status,
+                    author_id=author_id
+                )
+                db.session.add(doc)
+            db.session.commit()
+            logger.info("Seeded 5 sample DocHub documents")
+    except Exception as seed_err:
+        logger.warning(f"Could not seed DocHub samples (non-critical): {seed_err}")
+
+# Blueprints registered by create_app: (module, blueprint attribute, url prefix, label, placeholder).
+# url prefix None = the blueprint's own prefix. All are CSRF-exempt (JWT-authenticated APIs
+# and multipart uploads). Modules are imported only here, when registration needs them.
+# placeholder=True: if the import fails, serve a 500 page at the prefix instead of a bare 404.
+BLUEPRINTS = (
+    ('module_hvac_mep.routes', 'hvac_mep_bp', '/hvac-mep', 'HVAC & MEP', True),  # Must be /hvac-mep with dash
+    ('module_civil.routes', 'civil_bp', '/civil', 'Civil', True),
+    ('module_cleaning.routes', 'cleaning_bp', '/cleaning', 'Cleaning', True),
+    ('app.auth.routes', 'auth_bp', None, 'Authentication', False),
+    ('app.admin.routes', 'admin_bp', None, 'Admin', False),
+    ('app.workflow.routes', 'workflow_bp', None, 'Workflow', False),
+    ('app.bd.routes', 'bd_bp', None, 'BD', False),
+    ('app.docs.routes', 'docs_bp', None, 'DocHub API', False),
+    ('module_procurement.routes', 'procurement_bp', '/procurement', 'Procurement', False),
+    ('module_hr.routes', 'hr_bp', '/hr', 'HR', False),
+    ('module_inspection.routes', 'inspection_bp', None, 'Inspection', False),
+    ('module_mmr.routes', 'mmr_bp', None, 'MMR', False),
+    ('app.reports_api', 'reports_bp', None, 'Reports API', False),  # on-demand regeneration
+)
+
+
+def _add_slash_redirect(path):
+    """Setup hook: /hr (no trailing slash) redirects to the blueprint index /hr/"""
+    def setup(app):
+        app.add_url_rule(path, endpoint=f"redirect_{path.strip('/')}_to_slash",
+                         view_func=lambda: redirect(path + '/', code=302))
+    return setup
+
+
+def _start_mmr_scheduler(app):
+    """Setup hook: APScheduler for the daily MMR report emails"""
+    try:
+        from module_mmr.scheduler import init_scheduler as init_mmr_scheduler
+        init_mmr_scheduler(app)
+    except Exception as sched_err:
+        logger.warning(f"⚠️  MMR scheduler not started: {sched_err}")
+
+
+# Extra setup run right after a blueprint registers, keyed by blueprint attribute
+BLUEPRINT_SETUP = {
+    'hr_bp': _add_slash_redirect('/hr'),
+    'inspection_bp': _add_slash_redirect('/inspection'),
+    'mmr_bp': _start_mmr_scheduler,
+}
+
+
+def _module_missing_view(label):
+    """Placeholder view for a field module whose blueprint failed to import"""
+    def module_missing():
+        return (
+            f"{label} module is not available on this deployment. "
+            "Check server logs for import errors."
+        ), 500
+    return module_missing
+
+
+# Ensure required directories exist (critical for Render deployment), once per process and
+# before create_app writes the schema fingerprint into GENERATED_DIR.
+# Leaf directories only: makedirs creates GENERATED_DIR on the way to them
 try:
-    from module_mmr.routes import mmr_bp  # noqa: F401
-    logger.info("Imported module_mmr.routes.mmr_bp")
+    _ensure_dirs(UPLOADS_DIR, JOBS_DIR, os.path.join(GENERATED_DIR, 'dochub', 'inline'))
+    logger.info("✅ Directory structure verified (GENERATED_DIR=%s)", GENERATED_DIR)
 except Exception as e:
-    logger.exception("Could not import module_mmr.routes.mmr_bp: %s", e)
-    mmr_bp = None
+    logger.error(f"❌ Failed to create directories: {e}")
+    # Don't fail, continue anyway (may be permissions issue)
+
+
+# Config values exported to os.environ for libraries that read the environment directly
+ENV_EXPORTED_CONFIG = ('CLOUDINARY_CLOUD_NAME', 'CLOUDINARY_API_KEY', 'CLOUDINARY_API_SECRET', 'REDIS_URL')
+
+# Added to every response, file downloads included (nosniff matters most for user uploads)
+SECURITY_HEADERS = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'SAMEORIGIN',
+    'X-XSS-Protection': '1; mode=block',
+}
+
+# Read size for streaming generated downloads (reports can be tens of MB)
+GENERATED_CHUNK_SIZE = 64 * 1024
+# Reports are per-user documents: no shared caches, always revalidate (cheap 304s via ETag)
+GENERATED_CACHE_CONTROL = 'private, max-age=0, must-revalidate'
+
+
+def _in_memory_file_view(app, filename, mimetype):
+    """View serving a small static file read once at startup, with a strong ETag and conditional GET"""
+    try:
+        with open(os.path.join(app.static_folder, filename), 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        logger.warning(f"⚠️  Could not read static/{filename}: {e}")
+        data = None
+    etag = hashlib.sha256(data).hexdigest()[:32] if data is not None else None
+    max_age = app.config.get('SEND_FILE_MAX_AGE_DEFAULT')
+
+    def view():
+        if data is None:
+            abort(404)
+        response = app.response_class(data, mimetype=mimetype)
+        response.set_etag(etag)
+        if max_age:
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.no_cache = True
+        return response.make_conditional(request)
 
-# Ensure required directories exist at startup
-os.makedirs(GENERATED_DIR, exist_ok=True)
-os.makedirs(UPLOADS_DIR, exist_ok=True)
-os.makedirs(JOBS_DIR, exist_ok=True)
+    return view
 
-# Simple background executor for report generation tasks
-# Reduced to 1 worker for free tier memory constraints (512MB limit)
-executor = ThreadPoolExecutor(max_workers=1)
+
+def _set_inline_disposition(response, download_name):
+    """Set an inline Content-Disposition, using RFC 5987 encoding for non-ASCII names."""
+    if download_name.isascii():
+        response.headers.set('Content-Disposition', 'inline', filename=download_name)
+    else:
+        response.headers['Content-Disposition'] = f"inline; filename*=UTF-8''{quote(download_name)}"
 
 
 def create_app():
     app = Flask(__name__, static_folder='static', template_folder='templates')
 
+    # Encode/decode JSON with orjson when installed (same output as Flask's default provider)
+    try:
+        from common.json_provider import OrjsonProvider
+        app.json = OrjsonProvider(app)
+    except ImportError:
+        logger.info("orjson not installed - using the standard JSON encoder")
+
     # Some container images lack /etc/mime.types; browsers enforce nosniff on CSS/JS.
     mimetypes.add_type("text/css", ".css")
     mimetypes.add_type("application/javascript", ".js")
     mimetypes.add_type("application/json", ".json")
-    
-    # Enable template auto-reload for development
-    app.config['TEMPLATES_AUTO_RELOAD'] = True
 
-    # Load configuration from config.py
-    # Import config module and load all uppercase variables (config settings)
-    import config as config_module
-    # Use vars() to get only attributes defined in the module, not imported ones
-    for key, value in vars(config_module).items():
-        if key.isupper() and not key.startswith('_') and not callable(value):
-            app.config[key] = value
+    # Load configuration from config.py (all UPPERCASE module attributes)
+    app.config.from_object('config')
+
+    # Template auto-reload only in development: elsewhere Jinja would stat() the template
+    # file on every render_template to see whether it changed
+    app.config['TEMPLATES_AUTO_RELOAD'] = app.config.get('FLASK_ENV', 'development') == 'development'
     
     # Validate configuration
-    from common.config_validator import validate_config
+    from common.config_validator import validate_config, WEAK_SECRET_KEYS
     is_valid, errors = validate_config(app)
     
     if not is_valid:
@@ -167,9 +573,12 @@ def create_app():
     db.init_app(app)
     bcrypt.init_app(app)
     
-    # Initialize Flask-Migrate for database migrations
-    from flask_migrate import Migrate
-    migrate = Migrate(app, db)
+    # Flask-Migrate is only used by the `flask db ...` commands. Importing it pulls in Alembic
+    # (~0.7s), so web workers (gunicorn, python Injaaz.py, tests) skip it: the flask CLI is
+    # the only place the app is created inside a click context.
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+        Migrate(app, db)
     
     # Initialize JWT
     jwt = JWTManager(app)
@@ -192,298 +601,53 @@ def create_app():
     @jwt.unauthorized_loader
     def unauthorized_callback(callback):
         """Handle missing or invalid JWT token"""
-        # Check if this is a page render route (returns HTML) vs API route (returns JSON)
-        # Page render routes: /api/workflow/history, /api/workflow/pending-reviews, etc.
-        page_render_routes = ['/api/workflow/history', '/api/workflow/pending-reviews']
-        if request.path in page_render_routes:
-            # For page render routes, redirect to login
-            from flask import redirect, url_for
-            return redirect(url_for('login_page')), 302
-        elif request.path.startswith('/api/') or '/api/' in request.path:
-            return jsonify({"success": False, "error": "Authentication required"}), 401
-        # For other HTML pages, redirect to login
-        from flask import redirect, url_for
-        return redirect(url_for('login_page')), 302
+        return _auth_failure("Authentication required")
     
     @jwt.invalid_token_loader
     def invalid_token_callback(callback):
         """Handle invalid JWT token"""
-        # Check if this is a page render route
-        page_render_routes = ['/api/workflow/history', '/api/workflow/pending-reviews']
-        if request.path in page_render_routes:
-            from flask import redirect, url_for
-            return redirect(url_for('login_page')), 302
-        elif request.path.startswith('/api/') or '/api/' in request.path:
-            return jsonify({"success": False, "error": "Invalid token"}), 401
-        from flask import redirect, url_for
-        return redirect(url_for('login_page')), 302
+        return _auth_failure("Invalid token")
     
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
         """Handle expired JWT token"""
-        # Check if this is a page render route
-        page_render_routes = ['/api/workflow/history', '/api/workflow/pending-reviews']
-        if request.path in page_render_routes:
-            from flask import redirect, url_for
-            return redirect(url_for('login_page')), 302
-        elif request.path.startswith('/api/') or '/api/' in request.path:
-            return jsonify({"success": False, "error": "Token has expired"}), 401
-        from flask import redirect, url_for
-        return redirect(url_for('login_page')), 302
+        return _auth_failure("Token has expired")
+    
+    # Revocation answers are cached per process for JWT_REVOCATION_CACHE_TTL seconds
+    revocation_cache.ttl = app.config.get('JWT_REVOCATION_CACHE_TTL', 30)
     
     # JWT token verification callback (check if token is revoked)
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
-        from app.models import Session
-        from common.jwt_session import sync_access_session_row
-
         if jwt_payload.get('type') == 'refresh':
             return False
-        jti = jwt_payload.get('jti')
-        if not jti:
-            return True
-        session = Session.query.filter_by(token_jti=jti).first()
-        if session is None:
-            session = sync_access_session_row(jti, jwt_payload)
-        if session is None:
-            logger.warning(
-                "JWT blocklist: missing session for jti=%s sub=%s — token treated as revoked",
-                jti,
-                jwt_payload.get('sub'),
-            )
-            return True
-        return session.is_revoked
+        return is_access_token_revoked(jwt_payload.get('jti'), jwt_payload)
     
     logger.info("✅ Database and JWT initialized")
     
     # Automatic database initialization and migration (fully self-contained for Render)
     with app.app_context():
         try:
-            import time
-            from sqlalchemy import inspect, text
-            
-            # Retry logic for database connection (Render databases may need a moment)
-            max_retries = 5
-            retry_delay = 2
-            inspector = None
-            
-            for attempt in range(max_retries):
-                try:
-                    inspector = inspect(db.engine)
-                    # Test connection by getting table names
-                    inspector.get_table_names()
-                    logger.info("✅ Database connection verified")
-                    break
-                except Exception as conn_error:
-                    if attempt < max_retries - 1:
-                        logger.info(f"Database connection attempt {attempt + 1}/{max_retries} failed, retrying in {retry_delay}s...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2
-                    else:
-                        logger.error(f"❌ Failed to connect to database after {max_retries} attempts: {conn_error}")
-                        raise
-            
-            # Step 1: Create all tables if they don't exist (fully automatic)
-            logger.info("Ensuring all database tables exist...")
-            try:
-                db.create_all()
-                logger.info("✅ All database tables verified/created")
-            except Exception as create_error:
-                logger.warning(f"Table creation check: {create_error}")
-                # Continue anyway - tables might already exist
-            
-            # Step 2: Database migrations are now handled by Flask-Migrate
-            # Run migrations manually using: flask db upgrade
-            # This ensures version-controlled, reversible migrations
-            logger.info("✅ Database tables verified. Use 'flask db upgrade' to apply migrations.")
-            
-            # Step 2.5: Add missing columns if tables exist (one-time migration for existing databases)
-            inspector = inspect(db.engine)
-            if 'users' in inspector.get_table_names():
-                columns = [col['name'] for col in inspector.get_columns('users')]
-                missing_columns = []
-                
-                # Check for designation column
-                if 'designation' not in columns:
-                    missing_columns.append(('designation', 'VARCHAR(20) DEFAULT NULL'))
-                
-                if missing_columns:
-                    logger.info(f"Adding missing columns to users table: {[col[0] for col in missing_columns]}")
-                    try:
-                        with db.engine.begin() as conn:
-                            for col_name, col_def in missing_columns:
-                                try:
-                                    conn.execute(text(f"ALTER TABLE users ADD COLUMN {col_name} {col_def}"))
-                                    logger.info(f"✅ Added {col_name} column to users table")
-                                except Exception as col_error:
-                                    error_str = str(col_error).lower()
-                                    if 'already exists' in error_str or 'duplicate' in error_str:
-                                        logger.info(f"Column {col_name} already exists, skipping")
-                                    else:
-                                        logger.warning(f"Could not add {col_name}: {col_error}")
-                    except Exception as e:
-                        logger.warning(f"Could not add missing columns (non-critical): {e}")
-            
-            if 'submissions' in inspector.get_table_names():
-                columns = [col['name'] for col in inspector.get_columns('submissions')]
-                missing_columns = []
-                
-                # Check for workflow columns
-                workflow_fields = [
-                    ('workflow_status', "VARCHAR(30) DEFAULT 'submitted'"),
-                    ('supervisor_id', 'INTEGER'),
-                    ('manager_id', 'INTEGER'),
-                    ('supervisor_notified_at', 'TIMESTAMP DEFAULT NULL'),
-                    ('supervisor_reviewed_at', 'TIMESTAMP DEFAULT NULL'),
-                    ('manager_notified_at', 'TIMESTAMP DEFAULT NULL'),
-                    ('manager_reviewed_at', 'TIMESTAMP DEFAULT NULL')
-                ]
-                
-                for col_name, col_def in workflow_fields:
-                    if col_name not in columns:
-                        missing_columns.append((col_name, col_def))
-                
-                if missing_columns:
-                    logger.info(f"Adding missing workflow columns to submissions table: {[col[0] for col in missing_columns]}")
-                    try:
-                        with db.engine.begin() as conn:
-                            for col_name, col_def in missing_columns:
-                                try:
-                                    conn.execute(text(f"ALTER TABLE submissions ADD COLUMN {col_name} {col_def}"))
-                                    logger.info(f"✅ Added {col_name} column to submissions table")
-                                except Exception as col_error:
-                                    error_str = str(col_error).lower()
-                                    if 'already exists' in error_str or 'duplicate' in error_str:
-                                        logger.info(f"Column {col_name} already exists, skipping")
-                                    else:
-                                        logger.warning(f"Could not add {col_name}: {col_error}")
-                    except Exception as e:
-                        logger.warning(f"Could not add missing workflow columns (non-critical): {e}")
-
-            if 'dochub_documents' in inspector.get_table_names():
-                columns = [col['name'] for col in inspector.get_columns('dochub_documents')]
-                missing_columns = []
-                if 'doc_type' not in columns:
-                    missing_columns.append(('doc_type', "VARCHAR(20) DEFAULT 'upload'"))
-                if 'content' not in columns:
-                    missing_columns.append(('content', 'TEXT'))
-                if 'inline_asset' not in columns:
-                    # PostgreSQL rejects BOOLEAN DEFAULT 0; use FALSE (SQLite accepts FALSE too)
-                    missing_columns.append(('inline_asset', 'BOOLEAN DEFAULT FALSE'))
-                if 'reference_attachments' not in columns:
-                    missing_columns.append(('reference_attachments', 'TEXT'))
-                if missing_columns:
-                    logger.info(f"Adding DocHub columns: {[c[0] for c in missing_columns]}")
-                    for col_name, col_def in missing_columns:
-                        try:
-                            with db.engine.begin() as conn:
-                                conn.execute(text(f"ALTER TABLE dochub_documents ADD COLUMN {col_name} {col_def}"))
-                            logger.info(f"✅ Added {col_name} to dochub_documents")
-                        except Exception as col_error:
-                            err = str(col_error).lower()
-                            if 'already exists' in err or 'duplicate' in err:
-                                logger.info(f"Column {col_name} already exists")
-                            else:
-                                logger.warning(f"Could not add {col_name}: {col_error}")
-
-            # Step 3: Ensure default admin user exists (fully automatic for Render)
-            try:
-                from app.models import User
-                admin = User.query.filter_by(username='admin').first()
-                if not admin:
-                    logger.info("Creating default admin user...")
-                    admin = User(
-                        username='admin',
-                        email='admin@injaaz.com',
-                        full_name='System Administrator',
-                        role='admin',
-                        is_active=True,
-                        access_hvac=True,
-                        access_civil=True,
-                        access_cleaning=True
-                    )
-                    # Use environment variable for default password, or generate random one
-                    import secrets
-                    default_password = os.environ.get('DEFAULT_ADMIN_PASSWORD', None)
-                    if not default_password:
-                        # Generate a secure random password if not set
-                        default_password = secrets.token_urlsafe(16)
-                        logger.warning("⚠️  No DEFAULT_ADMIN_PASSWORD set - using generated password")
-                        # Log to a secure location (not just console)
-                        logger.critical(f"🔐 DEFAULT ADMIN PASSWORD GENERATED: {default_password}")
-                        logger.critical("⚠️  SECURITY: Change this password immediately after first login!")
-                    
-                    admin.set_password(default_password)
-                    admin.password_changed = False  # Force password change on first login
-                    db.session.add(admin)
-                    db.session.commit()
-                    logger.info("✅ Default admin user created")
-                    if not os.environ.get('DEFAULT_ADMIN_PASSWORD'):
-                        logger.critical(f"⚠️  CRITICAL: Default admin password is: {default_password}")
-                        logger.critical("⚠️  This password will be required on first login. CHANGE IT IMMEDIATELY!")
-                    else:
-                        logger.warning("⚠️  Default admin password set from DEFAULT_ADMIN_PASSWORD env var")
-                        logger.warning("⚠️  Password change will be required on first login")
-                else:
-                    logger.info("✅ Admin user already exists")
-            except Exception as admin_create_error:
-                logger.warning(f"Could not create admin user (non-critical): {admin_create_error}")
-            else:
-                logger.info("Users table will be created when first user is registered")
+            # One bounded connection check (connect_timeout in SQLALCHEMY_ENGINE_OPTIONS) instead of
+            # sleeping through retries: a worker that cannot reach the database logs it and starts;
+            # pool_pre_ping reconnects on the first request once the database is back.
+            with db.engine.connect() as conn:
+                conn.execute(text('SELECT 1'))
+            logger.info("✅ Database connection verified")
+
+            # Steps 1-2.5: tables and added columns. Done by `flask --app Injaaz init-db` (run once
+            # before gunicorn starts); at worker boot only when AUTO_MIGRATE is on (development)
+            if app.config.get('AUTO_MIGRATE'):
+                _migrate_schema(app.config['SQLALCHEMY_DATABASE_URI'])
+
+            # Step 3: Default admin user. Created by `flask --app Injaaz init-admin` / `init-db`;
+            # at worker boot only when BOOTSTRAP_ADMIN is on (development)
+            if app.config.get('BOOTSTRAP_ADMIN'):
+                _ensure_admin_user()
 
             # Step 4: Seed sample DocHub documents if empty
-            try:
-                from app.models import DocHubDocument, User
-                if DocHubDocument.query.count() == 0:
-                    admin_user = User.query.filter_by(role='admin').first()
-                    author_id = admin_user.id if admin_user else None
-                    samples = [
-                        ('Employee Onboarding Guide', 'onboarding', 'published',
-                         '<h1>Employee Onboarding Guide</h1>'
-                         '<div class="callout callout-blue"><span class="callout-icon">👋</span><div><strong>Welcome to the team!</strong> This guide will help you get up and running quickly.</div></div>'
-                         '<h2>1. Company Overview</h2><p>Injaaz Facilities Management delivers excellence in facility services across the UAE.</p>'
-                         '<h2>2. Your First Week</h2><ul><li><strong>Day 1:</strong> Meet your team lead, set up workstation</li>'
-                         '<li><strong>Day 2:</strong> System access, security training</li><li><strong>Day 3-5:</strong> Department walkthroughs</li></ul>'
-                         '<h2>3. Key Contacts</h2><ul><li><strong>HR:</strong> arshith@injaaz.ae</li><li><strong>IT:</strong> +971 50 156 0277</li></ul>'),
-                        ('Project Services Agreement Template', 'contracts', 'review',
-                         '<h1>Project Services Agreement</h1><p><em>Agreement between Service Provider and Client.</em></p>'
-                         '<h2>1. Parties</h2><p><strong>Service Provider:</strong> Injaaz FM.<br/><strong>Client:</strong> [Client Name].</p>'
-                         '<h2>2. Scope</h2><ul><li>Facility management services</li><li>Maintenance and repairs</li><li>Cleaning and HVAC</li></ul>'
-                         '<h2>3. Payment Terms</h2><p>As per agreed milestones.</p>'),
-                        ('Remote Work Policy', 'policies', 'published',
-                         '<h1>Remote Work Policy</h1><div class="callout"><span class="callout-icon">⚠️</span><div>Effective January 2025.</div></div>'
-                         '<h2>1. Purpose</h2><p>Guidelines for remote work to ensure productivity and security.</p>'
-                         '<h2>2. Eligibility</h2><p>Available after 90-day probation.</p>'
-                         '<h2>3. Core Hours</h2><p>10:00 AM – 3:00 PM local time.</p>'),
-                        ('DocHub User Manual', 'manuals', 'published',
-                         '<h1>DocHub User Manual</h1><p><em>Version 1.0 — March 2025</em></p>'
-                         '<h2>1. Getting Started</h2><p>DocHub is your document management platform.</p>'
-                         '<h2>2. Creating Documents</h2><ol><li>Click + New Document</li><li>Select a template</li><li>Edit and Save</li></ol>'
-                         '<h2>3. Shortcuts</h2><p><strong>Ctrl+S</strong> — Save. <strong>Ctrl+B</strong> — Bold.</p>'),
-                        ('Q1 2025 Performance Report', 'reports', 'draft',
-                         '<h1>Q1 2025 Performance Report</h1><p><em>Analytics Team — April 2025</em></p>'
-                         '<div class="callout callout-green"><span class="callout-icon">📈</span><div>Strong quarter across key metrics.</div></div>'
-                         '<h2>1. Executive Summary</h2><p>Q1 marked a solid start to the fiscal year.</p>'
-                         '<h2>2. Key Metrics</h2><table><tr><th>Metric</th><th>Target</th><th>Actual</th></tr>'
-                         '<tr><td>Revenue</td><td>—</td><td>—</td></tr><tr><td>Projects</td><td>—</td><td>—</td></tr></table>'),
-                    ]
-                    for title, cat, status, content in samples:
-                        doc = DocHubDocument(
-                            title=title,
-                            filename='',
-                            stored_path='',
-                            file_type='',
-                            doc_type='content',
-                            content=content,
-                            category=cat,
-                            status=status,
-                            author_id=author_id
-                        )
-                        db.session.add(doc)
-                    db.session.commit()
-                    logger.info("Seeded 5 sample DocHub documents")
-            except Exception as seed_err:
-                logger.warning(f"Could not seed DocHub samples (non-critical): {seed_err}")
+            if app.config.get('AUTO_MIGRATE'):
+                _seed_dochub_samples()
 
             logger.info("✅ Database initialization and migration complete")
             
@@ -493,24 +657,20 @@ def create_app():
             # Don't fail startup - app might still work if tables exist
             logger.warning("⚠️  App will continue, but some features may not work until database is initialized")
     
-    # Set environment variables for cloudinary library
-    if app.config.get('CLOUDINARY_CLOUD_NAME'):
-        os.environ['CLOUDINARY_CLOUD_NAME'] = app.config['CLOUDINARY_CLOUD_NAME']
-    if app.config.get('CLOUDINARY_API_KEY'):
-        os.environ['CLOUDINARY_API_KEY'] = app.config['CLOUDINARY_API_KEY']
-    if app.config.get('CLOUDINARY_API_SECRET'):
-        os.environ['CLOUDINARY_API_SECRET'] = app.config['CLOUDINARY_API_SECRET']
-    
-    # Set Redis URL for other services
-    redis_url = app.config.get('REDIS_URL')
-    if redis_url:
-        os.environ['REDIS_URL'] = redis_url
-    
+    # The cloudinary library and other Redis users read these from the environment. config.py
+    # took them from there (REDIS_URL whitespace-stripped), so only differing values are written
+    env_updates = {
+        key: app.config[key] for key in ENV_EXPORTED_CONFIG
+        if app.config.get(key) and os.environ.get(key) != app.config[key]
+    }
+    if env_updates:
+        os.environ.update(env_updates)
+
     logger.info(f"✅ Cloudinary configured: {app.config.get('CLOUDINARY_CLOUD_NAME')}")
     
     # Warn if using default secret (only in dev)
     flask_env = app.config.get('FLASK_ENV', 'development')
-    if flask_env != 'production' and app.config['SECRET_KEY'] in ['dev-secret-change-in-production', 'change-me-in-production']:
+    if flask_env != 'production' and app.config['SECRET_KEY'] in WEAK_SECRET_KEYS:
         logger.warning("⚠️  Using default SECRET_KEY! Set SECRET_KEY in .env for production!")
 
     # App-wide config used by blueprints and utils
@@ -518,50 +678,74 @@ def create_app():
     app.config['GENERATED_DIR'] = GENERATED_DIR
     app.config['UPLOADS_DIR'] = UPLOADS_DIR
     app.config['JOBS_DIR'] = JOBS_DIR
+    # Background executor for report generation tasks, one per app (jobs hold a reference to
+    # their app). EXECUTOR_MAX_WORKERS defaults to 1 for free tier memory constraints (512MB limit).
+    # Bounded queue: once EXECUTOR_MAX_QUEUE jobs are waiting, new jobs run in the submitting request instead
+    executor = BoundedThreadPoolExecutor(
+        max_workers=app.config['EXECUTOR_MAX_WORKERS'],
+        max_queue_size=app.config['EXECUTOR_MAX_QUEUE'],
+        thread_name_prefix='injaaz-report',
+    )
     app.config['EXECUTOR'] = executor
+    # Per-user report slots (REPORT_JOBS_PER_USER) taken by a request that never submitted its job
+    app.teardown_request(release_pending_report_slots)
     
-    # Ensure directories exist (critical for Render deployment)
-    try:
-        os.makedirs(GENERATED_DIR, exist_ok=True)
-        os.makedirs(UPLOADS_DIR, exist_ok=True)
-        os.makedirs(JOBS_DIR, exist_ok=True)
-        os.makedirs(os.path.join(GENERATED_DIR, 'dochub'), exist_ok=True)
-        os.makedirs(os.path.join(GENERATED_DIR, 'dochub', 'inline'), exist_ok=True)
-        logger.info("✅ Directory structure verified (GENERATED_DIR=%s)", GENERATED_DIR)
-    except Exception as e:
-        logger.error(f"❌ Failed to create directories: {e}")
-        # Don't fail, continue anyway (may be permissions issue)
-    
-    # Setup rate limiting with Redis
+    # Setup rate limiting with Redis (Flask-Limiter is imported only when a Redis URL is set)
     try:
-        from flask_limiter import Limiter
-        from flask_limiter.util import get_remote_address
-        
         # Get Redis URL from app config or environment
         redis_url = app.config.get('REDIS_URL') or os.environ.get('RATELIMIT_STORAGE_URL') or os.environ.get('REDIS_URL')
         if redis_url:
             redis_url = redis_url.strip()
-        
+
+        # The development server is one process: count in memory instead of paying a Redis round
+        # trip per request. Deployments with several workers need the shared Redis storage
+        # (set RATELIMIT_STORAGE_URL to use Redis in development too).
+        use_memory = (
+            app.config.get('FLASK_ENV', 'development') == 'development'
+            and not os.environ.get('RATELIMIT_STORAGE_URL')
+        )
+
         if redis_url:
-            try:
-                # Test Redis connection first (Upstash: use rediss:// URL from dashboard)
-                import redis
-                r = redis.from_url(redis_url, socket_connect_timeout=5)
-                r.ping()
-                logger.info("✓ Redis connection test successful")
-                
-                limiter = Limiter(
-                    app=app,
-                    key_func=get_remote_address,
-                    default_limits=[os.environ.get('RATELIMIT_DEFAULT', '100 per hour')],
-                    storage_uri=redis_url,
-                    strategy="fixed-window"
-                )
-                app.limiter = limiter
-                logger.info("✓ Rate limiting enabled with Redis storage")
-            except Exception as redis_error:
-                logger.warning(f"⚠️  Redis connection failed - Rate limiting disabled: {redis_error}")
-                app.limiter = None
+            import redis
+            # One bounded connection pool per worker, shared by the rate limiter and common.cache.
+            # Connections open on first use and are kept alive between requests.
+            app.extensions['redis_pool'] = redis.BlockingConnectionPool.from_url(
+                redis_url,
+                max_connections=int(os.environ.get('REDIS_MAX_CONNECTIONS', 16)),
+                timeout=5,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+                socket_keepalive=True,
+            )
+
+            from flask_limiter import Limiter
+            from flask_limiter.util import get_remote_address
+            # No connection test here: Redis is contacted on the first rate-limited request, so
+            # a slow Redis does not hold up worker boot (Upstash: use rediss:// URL from dashboard).
+            # While Redis is unreachable, limits are counted in memory per worker; Flask-Limiter
+            # re-checks Redis with backoff and switches back once it answers.
+            limiter = Limiter(
+                app=app,
+                key_func=get_remote_address,
+                # No blanket limit by default: login, registration, form submissions and photo
+                # uploads carry their own @rate_limit_if_available limits. RATELIMIT_DEFAULT
+                # (e.g. "1000 per hour") adds a per-IP limit on every route.
+                default_limits=[os.environ['RATELIMIT_DEFAULT']] if os.environ.get('RATELIMIT_DEFAULT') else [],
+                storage_uri='memory://' if use_memory else redis_url,
+                storage_options={'connection_pool': app.extensions['redis_pool']},
+                # moving-window (one atomic Lua call per check) has no burst at window edges:
+                # fixed-window lets a client spend two full quotas around the boundary
+                strategy=os.environ.get('RATELIMIT_STRATEGY', 'moving-window'),
+                in_memory_fallback_enabled=True,
+            )
+            app.limiter = limiter
+            if use_memory:
+                logger.info("✓ Rate limiting enabled with in-memory storage (development)")
+            else:
+                # Open the first Redis connection (TCP + TLS for Upstash) in the background, so
+                # neither boot nor the first rate-limited request waits for the handshake
+                threading.Thread(target=limiter.storage.check, name='ratelimit-warmup', daemon=True).start()
+                logger.info("✓ Rate limiting enabled with Redis storage (in-memory fallback)")
         else:
             logger.info("✓ Rate limiting disabled (no Redis URL configured)")
             app.limiter = None
@@ -572,10 +756,17 @@ def create_app():
         logger.warning(f"⚠️  Rate limiting setup failed: {e}")
         app.limiter = None
     
+    # Compress JSON/HTML responses (if Flask-Compress available). Streamed responses -
+    # /static and /generated files, DocHub proxy downloads - are left untouched.
+    try:
+        from flask_compress import Compress
+        Compress(app)
+        logger.info("✓ Response compression enabled")
+    except ImportError:
+        logger.warning("⚠️  Flask-Compress not installed - responses sent uncompressed")
+    
     # Setup CSRF protection (if Flask-WTF available)
     try:
-        from flask_wtf.csrf import CSRFProtect
-        
         # Enable CSRF in production by default, disable in dev unless explicitly enabled
         enable_csrf = (
             os.environ.get('FLASK_ENV') == 'production' or 
@@ -583,6 +774,7 @@ def create_app():
         ) and os.environ.get('DISABLE_CSRF', '').lower() != 'true'
         
         if enable_csrf:
+            from flask_wtf.csrf import CSRFProtect
             csrf = CSRFProtect(app)
             app.csrf = csrf
             logger.info("✓ CSRF protection enabled (API routes will be exempted)")
@@ -594,11 +786,14 @@ def create_app():
         app.csrf = None
     
     # Global error handlers
+    # Checked once: 404s (bot scans) should not cost a stat() each
+    has_404_template = os.path.exists(os.path.join(app.root_path, app.template_folder, '404.html'))
+
     @app.errorhandler(404)
     def not_found(e):
-        if request.path.startswith('/api/'):
+        if _wants_json():
             return jsonify({"success": False, "error": "Resource not found"}), 404
-        return render_template('404.html') if os.path.exists(os.path.join(app.template_folder, '404.html')) else ("Not Found", 404)
+        return (render_template('404.html'), 404) if has_404_template else ("Not Found", 404)
     
     @app.errorhandler(413)
     def too_large(e):
@@ -617,7 +812,7 @@ def create_app():
     @app.errorhandler(400)
     def bad_request(e):
         """Handle 400 errors - return JSON for API routes"""
-        if request.path.startswith('/api/'):
+        if _wants_json():
             return jsonify({"error": "Bad request", "message": str(e)}), 400
         return str(e), 400
     
@@ -631,187 +826,57 @@ def create_app():
         logger.exception(f"Unhandled exception: {e}")
         
         # Return JSON error for API calls
-        if request.path.startswith('/api/') or request.is_json:
+        if _wants_json():
             return jsonify({"error": "An unexpected error occurred"}), 500
         
         # Return HTML error for browser requests
         return "An unexpected error occurred", 500
     
+    # Page shells (offline, login, dashboard, ...) take no per-request data (auth and content are loaded by JS),
+    # so outside development each one is rendered once per process and reused
+    cache_pages = app.config.get('FLASK_ENV', 'development') != 'development'
+    rendered_pages = {}
+
+    def render_page(template, **context):
+        if not cache_pages:
+            return render_template(template, **context)
+        key = (template, tuple(sorted(context.items())))
+        html = rendered_pages.get(key)
+        if html is None:
+            html = rendered_pages[key] = render_template(template, **context)
+        return html
+
     # PWA Routes
     @app.route('/offline')
     def offline():
         """Offline fallback page for PWA"""
-        return render_template('offline.html')
+        return render_page('offline.html')
     
-    @app.route('/manifest.json')
-    def pwa_manifest():
-        """Serve PWA manifest (use static_folder so path works regardless of process cwd)."""
-        return send_from_directory(
-            app.static_folder, 'manifest.json', mimetype='application/manifest+json'
-        )
-    
-    @app.route('/favicon.ico')
-    def favicon():
-        """Serve favicon"""
-        return send_from_directory(app.static_folder, 'logo.png', mimetype='image/png')
+    # PWA manifest and favicon: read once (static_folder, so the path works regardless of
+    # process cwd) and served from memory with an ETag; revalidations get a 304
+    app.add_url_rule('/manifest.json', 'pwa_manifest',
+                     _in_memory_file_view(app, 'manifest.json', 'application/manifest+json'))
+    app.add_url_rule('/favicon.ico', 'favicon', _in_memory_file_view(app, 'logo.png', 'image/png'))
 
-    # Register blueprints only if they were imported successfully.
-    if hvac_mep_bp:
-        # Exempt from CSRF (handles file uploads via API)
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(hvac_mep_bp)
-        
-        app.register_blueprint(hvac_mep_bp, url_prefix='/hvac-mep')  # Must be /hvac-mep with dash
-        logger.info("✓ Registered HVAC/MEP blueprint at /hvac-mep")
-    else:
-        # Provide a helpful placeholder endpoint so someone visiting knows the blueprint failed to import
-        @app.route('/hvac-mep')
-        def hvac_mep_missing():
-            return (
-                "HVAC & MEP module is not available on this deployment. "
-                "Check server logs for import errors."
-            ), 500
-
-    if civil_bp:
-        # Exempt from CSRF (handles file uploads via API)
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(civil_bp)
-        
-        app.register_blueprint(civil_bp, url_prefix='/civil')
-        logger.info("Registered blueprint: /civil")
-    else:
-        @app.route('/civil')
-        def civil_missing():
-            return (
-                "Civil module is not available on this deployment. "
-                "Check server logs for import errors."
-            ), 500
-
-    if cleaning_bp:
-        # Exempt from CSRF (handles file uploads via API)
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(cleaning_bp)
-        
-        app.register_blueprint(cleaning_bp, url_prefix='/cleaning')
-        logger.info("Registered blueprint: /cleaning")
-    else:
-        @app.route('/cleaning')
-        def cleaning_missing():
-            return (
-                "Cleaning module is not available on this deployment. "
-                "Check server logs for import errors."
-            ), 500
-
-    # Register authentication blueprint
-    if auth_bp:
-        # Exempt auth blueprint from CSRF (uses JWT instead)
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(auth_bp)
-        
-        app.register_blueprint(auth_bp)  # Already has /api/auth prefix
-        logger.info("✅ Registered authentication blueprint at /api/auth")
-    else:
-        logger.warning("⚠️  Authentication blueprint not available - check imports")
-    
-    # Register admin blueprint
-    if admin_bp:
-        # Exempt admin API from CSRF (uses JWT instead)
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(admin_bp)
-        app.register_blueprint(admin_bp)  # Already has /api/admin prefix
-        logger.info("✅ Registered admin blueprint at /api/admin")
-    else:
-        logger.warning("⚠️  Admin blueprint not available - check imports")
-    
-    # Register workflow blueprint
-    if workflow_bp:
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(workflow_bp)
-        app.register_blueprint(workflow_bp)  # Already has /api/workflow prefix
-        logger.info("✅ Registered workflow blueprint at /api/workflow")
-    else:
-        logger.warning("⚠️  Workflow blueprint not available - check imports")
-
-    # Register BD email module blueprint
-    if bd_bp:
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(bd_bp)
-        app.register_blueprint(bd_bp)
-        logger.info("✅ Registered BD blueprint at /bd")
-    else:
-        logger.warning("⚠️  BD blueprint not available - check imports")
-
-    # Register DocHub API blueprint
-    if docs_bp:
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(docs_bp)
-        app.register_blueprint(docs_bp)
-        logger.info("✅ Registered DocHub API blueprint at /api/docs")
-    else:
-        logger.warning("⚠️  DocHub API blueprint not available - check imports")
-    
-    # Register HR module blueprint
-    if hr_bp:
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(hr_bp)
-        app.register_blueprint(hr_bp, url_prefix='/hr')
-        # So /hr (no trailing slash) works: redirect to /hr/
-        @app.route('/hr')
-        def redirect_hr_to_slash():
-            return redirect('/hr/', code=302)
-        logger.info("✅ Registered HR blueprint at /hr")
-    else:
-        logger.warning("⚠️  HR blueprint not available - check imports")
-    
-    # Register Procurement module blueprint
-    if procurement_module_bp:
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(procurement_module_bp)
-        app.register_blueprint(procurement_module_bp, url_prefix='/procurement')
-        logger.info("✅ Registered Procurement blueprint at /procurement")
-    else:
-        logger.warning("⚠️  Procurement blueprint not available - check imports")
-    
-    # Register Inspection Form blueprint
-    if inspection_bp:
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(inspection_bp)
-        app.register_blueprint(inspection_bp)
-        @app.route('/inspection')
-        def redirect_inspection_to_slash():
-            return redirect('/inspection/', code=302)
-        logger.info("✅ Registered Inspection blueprint at /inspection")
-    else:
-        logger.warning("⚠️  Inspection blueprint not available - check imports")
-
-    # Register MMR blueprint
-    if mmr_bp:
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(mmr_bp)
-        app.register_blueprint(mmr_bp)
-        logger.info("✅ Registered MMR blueprint at /admin/mmr")
-        # Start APScheduler for daily report emails
-        try:
-            from module_mmr.scheduler import init_scheduler as init_mmr_scheduler
-            init_mmr_scheduler(app)
-        except Exception as sched_err:
-            logger.warning(f"⚠️  MMR scheduler not started: {sched_err}")
-    else:
-        logger.warning("⚠️  MMR blueprint not available")
+    # Register blueprints from the BLUEPRINTS table (imports happen here, not at module load).
+    # Imported inside an app context: the modules' rate_limit_if_available decorators look up
+    # current_app.limiter at import time and would otherwise silently skip their limits.
+    for module_path, attr, url_prefix, label, placeholder in BLUEPRINTS:
+        with app.app_context():
+            bp = _load_blueprint(module_path, attr)
+        if bp:
+            if hasattr(app, 'csrf') and app.csrf:
+                app.csrf.exempt(bp)
+            app.register_blueprint(bp, **({'url_prefix': url_prefix} if url_prefix else {}))
+            logger.info(f"✅ Registered {label} blueprint at {url_prefix or bp.url_prefix}")
+            if attr in BLUEPRINT_SETUP:
+                BLUEPRINT_SETUP[attr](app)
+        elif placeholder:
+            app.add_url_rule(url_prefix, endpoint=attr.replace('_bp', '_missing'),
+                             view_func=_module_missing_view(label))
+        else:
+            logger.warning(f"⚠️  {label} blueprint not available - check imports")
 
-    # Register reports API blueprint for on-demand regeneration
-    try:
-        from app.reports_api import reports_bp
-        
-        # Exempt reports API from CSRF (uses JWT if needed)
-        if hasattr(app, 'csrf') and app.csrf:
-            app.csrf.exempt(reports_bp)
-        
-        app.register_blueprint(reports_bp)
-        logger.info("✅ Registered reports API at /api/reports")
-    except Exception as e:
-        logger.warning(f"⚠️  Reports API not available: {e}")
-    
     # Temporary initialization endpoint - DISABLED FOR PRODUCTION SECURITY
     # Database already initialized on Render - no need for this endpoint
     # try:
@@ -824,21 +889,19 @@ def create_app():
     # Security headers middleware
     @app.after_request
     def add_security_headers(response):
-        response.headers['X-Content-Type-Options'] = 'nosniff'
-        response.headers['X-Frame-Options'] = 'SAMEORIGIN'
-        response.headers['X-XSS-Protection'] = '1; mode=block'
+        response.headers.update(SECURITY_HEADERS)
         return response
 
     # Authentication routes
-    @app.route('/login')
+    @app.route(LOGIN_PATH)
     def login_page():
         """Render login page"""
-        return render_template('login.html')
+        return render_page('login.html')
     
     @app.route('/register')
     def register_page():
         """Render register page"""
-        return render_template('register.html')
+        return render_page('register.html')
     
     @app.route('/logout')
     def logout_page():
@@ -849,27 +912,27 @@ def create_app():
     @app.route('/dashboard')
     def dashboard():
         """Protected dashboard - requires authentication"""
-        return render_template('dashboard.html')
+        return render_page('dashboard.html')
     
     @app.route('/about')
     def about():
         """About page - accessible to all users"""
-        return render_template('about.html')
+        return render_page('about.html')
     
     @app.route('/workflow/pending-reviews')
     def pending_reviews():
         """Pending reviews page - requires reviewer authentication"""
-        return render_template('pending_reviews.html')
+        return render_page('pending_reviews.html')
     
     @app.route('/workflow/submitted-forms')
     def submitted_forms():
         """Submitted forms page - supervisors can view their submissions"""
-        return render_template('submitted_forms.html')
+        return render_page('submitted_forms.html')
     
     @app.route('/admin/dashboard')
     def admin_dashboard():
         """Admin dashboard - requires admin authentication"""
-        return render_template('admin_dashboard.html', active_page='admin')
+        return render_page('admin_dashboard.html', active_page='admin')
 
     @app.route('/admin/mmr-chargeable')
     def mmr_chargeable_settings_page():
@@ -879,29 +942,28 @@ def create_app():
     @app.route('/admin/devices')
     def admin_devices():
         """Device management - admin only"""
-        return render_template('admin_device_management.html', active_page='devices')
+        return render_page('admin_device_management.html', active_page='devices')
 
     @app.route('/admin/bd')
     def admin_bd():
         """Business Development module - admin only"""
-        return render_template('admin_bd_module.html', active_page='bd-module')
+        return render_page('admin_bd_module.html', active_page='bd-module')
 
     @app.route('/admin/personal-progress')
     def admin_personal_progress():
         """Personal work-in-progress tracker — admin only"""
-        return render_template('admin_personal_progress.html', active_page='personal-progress')
+        return render_page('admin_personal_progress.html', active_page='personal-progress')
 
     @app.route('/dochub')
     def dochub():
         """DocHub module - all users with access"""
-        return render_template('dochub.html', active_page='dochub')
+        return render_page('dochub.html', active_page='dochub')
 
     # Root route: Show login page
     @app.route('/')
     def index():
         """Redirect to login page"""
-        from flask import redirect, url_for
-        return redirect(url_for('login_page'))
+        return redirect(request.script_root + LOGIN_PATH)
 
     # Serve generated files (downloads) - DEPRECATED in production (use cloud URLs)
     # This route is kept for backward compatibility in development only
@@ -909,49 +971,121 @@ def create_app():
     @app.route(f'/{GENERATED_DIR_NAME}/<path:filename>')
     def download_generated(filename):
         flask_env = app.config.get('FLASK_ENV', 'development')
+        accel_prefix = app.config.get('GENERATED_ACCEL_REDIRECT')
         
-        # In production, files should be served from cloud storage
-        if flask_env == 'production':
+        # In production, files should be served from cloud storage (unless a reverse
+        # proxy serves GENERATED_DIR from a persistent disk via X-Accel-Redirect)
+        if flask_env == 'production' and not accel_prefix:
             logger.warning(f"Attempted to access local file in production: {filename}")
             return jsonify({
                 'success': False,
                 'error': 'File serving from local filesystem is not available in production. Use cloud URLs instead.'
             }), 404
         
-        # Development fallback - serve from local filesystem
-        from common.security import safe_path_join
         try:
             safe_path = safe_path_join(GENERATED_DIR, filename)
-            if not os.path.exists(safe_path):
-                logger.warning(f"File not found: {filename}")
-                abort(404)
-            logger.info(f"Serving file from local filesystem (development): {filename}")
-            return send_from_directory(GENERATED_DIR, filename, as_attachment=False)
-        except ValueError as e:
+        except ValueError:
             logger.warning(f"Path traversal attempt blocked: {filename}")
             abort(403)
+        download_name = os.path.basename(safe_path)
+        mimetype = mimetypes.guess_type(safe_path)[0] or 'application/octet-stream'
+
+        # Nginx: hand the file off to an internal location so sendfile(2) pushes the bytes
+        # and no worker is held for the duration of the download
+        if accel_prefix:
+            rel_path = os.path.relpath(safe_path, GENERATED_DIR).replace(os.sep, '/')
+            response = app.response_class(mimetype=mimetype)
+            response.headers['X-Accel-Redirect'] = accel_prefix.rstrip('/') + '/' + quote(rel_path)
+            _set_inline_disposition(response, download_name)
+            return response
+
+        # Development fallback - stream from local filesystem.
+        # open() doubles as the existence check; fstat on the open file gives the size
+        # without another path lookup (send_from_directory re-joined and re-stat'ed the path)
+        try:
+            f = open(safe_path, 'rb')
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            logger.warning(f"File not found: {filename}")
+            abort(404)
+        st = os.fstat(f.fileno())
+
+        # Conditional GET: clients polling for a finished report get a bodyless 304
+        # straight from the fstat result, without reading a byte of the file
+        etag = f"{int(st.st_mtime)}-{st.st_size:x}"
+        last_modified = datetime.fromtimestamp(int(st.st_mtime), tz=timezone.utc)
+        if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            f.close()
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = GENERATED_CACHE_CONTROL
+            return response
+        logger.info(f"Serving file from local filesystem (development): {filename}")
+
+        # Stream in fixed-size chunks (wsgi.file_wrapper / sendfile when the server supports it)
+        response = app.response_class(
+            wrap_file(request.environ, f, buffer_size=GENERATED_CHUNK_SIZE),
+            mimetype=mimetype,
+            direct_passthrough=True,
+        )
+        response.content_length = st.st_size
+        response.headers['Cache-Control'] = GENERATED_CACHE_CONTROL
+        response.last_modified = last_modified
+        response.set_etag(etag)
+        # Werkzeug only adds Accept-Ranges to 206 responses; advertise it on the full 200 too
+        # so browsers / download managers know an interrupted download can be resumed
+        response.accept_ranges = 'bytes'
+        _set_inline_disposition(response, download_name)
+        return response.make_conditional(request, accept_ranges=True, complete_length=st.st_size)
+
+    # Database check for /health, reused for HEALTH_CACHE_TTL seconds: load balancers probe every
+    # few seconds per instance. The lock makes concurrent probes wait for one check, not each run one.
+    health_cache_ttl = app.config.get('HEALTH_CACHE_TTL', 2)
+    db_health = {'status': None, 'checked_at': 0.0}
+    db_health_lock = threading.Lock()
+
+    def database_status(fresh=False):
+        with db_health_lock:
+            if fresh or db_health['status'] is None or time.monotonic() - db_health['checked_at'] >= health_cache_ttl:
+                try:
+                    with db.engine.connect() as conn:
+                        conn.execute(text('SELECT 1'))
+                    db_health['status'] = 'healthy'
+                except Exception as e:
+                    logger.warning(f"Database health check failed: {e}")
+                    db_health['status'] = 'unhealthy'
+                db_health['checked_at'] = time.monotonic()
+            return db_health['status']
 
     # Health check endpoint for monitoring
     @app.route('/health', methods=['GET'])
     def health_check():
-        """Health check endpoint for monitoring and load balancers"""
-        try:
-            # Check database connection
-            with db.engine.connect() as conn:
-                conn.execute(text('SELECT 1'))
-            db_status = 'healthy'
-        except Exception as e:
-            logger.warning(f"Database health check failed: {e}")
-            db_status = 'unhealthy'
-        
+        """Health check endpoint for monitoring and load balancers (?deep=1: skip the cached DB result)"""
+        db_status = database_status(fresh=request.args.get('deep') == '1')
+
         health_status = {
             'status': 'healthy' if db_status == 'healthy' else 'degraded',
             'database': db_status,
-            'timestamp': datetime.utcnow().isoformat()
+            # The app's one connection pool (Flask-SQLAlchemy engine): size / in pool / overflow / checked out
+            'db_pool': db.engine.pool.status(),
+            'executor': executor.stats(),
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds')
         }
         
         status_code = 200 if health_status['status'] == 'healthy' else 503
-        return jsonify(health_status), status_code
+        # Probes must always reach the app, never a proxy/browser cache
+        return jsonify(health_status), status_code, {'Cache-Control': 'no-store'}
+
+    @app.cli.command('init-admin')
+    def init_admin_command():
+        """Create the default admin user if missing (run once per deploy, before gunicorn)"""
+        _ensure_admin_user()
+
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Create missing tables/columns, the default admin and sample DocHub documents (run once per deploy, before gunicorn)"""
+        _migrate_schema(app.config['SQLALCHEMY_DATABASE_URI'], force=True)
+        _ensure_admin_user()
+        _seed_dochub_samples()
 
     return app
 
@@ -1,9 +1,12 @@
 import os
 from flask import Flask
 from .config import config_by_name
-from .extensions import init_extensions
 
 def create_app(config_name=None):
+    # Imported here: extensions pulls in Flask-Migrate/Alembic and RQ, which importing
+    # app.models (every web worker) should not pay for
+    from .extensions import init_extensions
+
     if config_name is None:
         config_name = os.environ.get('FLASK_ENV', 'development')
     app = Flask(__name__, static_folder='../static', template_folder='templates')
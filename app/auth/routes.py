@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from app.models import db, User, Session, AuditLog
 from sqlalchemy.exc import IntegrityError
 from common.error_responses import error_response, success_response
+from common.jwt_session import revocation_cache
 import re
 
 auth_bp = Blueprint('auth_bp', __name__, url_prefix='/api/auth')
@@ -275,13 +276,16 @@ def logout():
     """Logout user and revoke token"""
     try:
         user_id = get_jwt_identity()
-        jti = get_jwt()['jti']
+        jwt_payload = get_jwt()
+        jti = jwt_payload['jti']
         
         # Revoke current session
         session = Session.query.filter_by(token_jti=jti).first()
         if session:
             session.is_revoked = True
             db.session.commit()
+        # Cache the revocation itself: a replayed token is rejected without a sessions query
+        revocation_cache.set(jti, True, str(user_id), jwt_payload.get('exp'))
         
         # Log logout
         log_audit(int(user_id), 'logout', 'user', user_id)
@@ -398,6 +402,7 @@ def change_password():
         # Revoke all existing sessions (force re-login)
         Session.query.filter_by(user_id=user_id, is_revoked=False).update({'is_revoked': True})
         db.session.commit()
+        revocation_cache.forget_user(user_id)
         
         # Log password change
         log_audit(user_id, 'change_password', 'user', str(user_id))
@@ -4,8 +4,8 @@ Middleware for JWT token validation and session checking
 from flask import jsonify, current_app
 from flask_jwt_extended import verify_jwt_in_request, get_jwt
 from functools import wraps
-from app.models import Session, User
-from common.jwt_session import sync_access_session_row
+from app.models import User
+from common.jwt_session import is_access_token_revoked
 
 
 def token_required(fn=None, *, locations=None):
@@ -24,10 +24,7 @@ def token_required(fn=None, *, locations=None):
                 jwt_data = get_jwt()
                 jti = jwt_data.get('jti')
 
-                session = Session.query.filter_by(token_jti=jti).first()
-                if session is None:
-                    session = sync_access_session_row(jti, jwt_data)
-                if not session or session.is_revoked:
+                if is_access_token_revoked(jti, jwt_data):
                     return jsonify({'success': False, 'error': 'Token has been revoked'}), 401
 
                 from flask_jwt_extended import get_jwt_identity
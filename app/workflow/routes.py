@@ -95,7 +95,6 @@ def get_module_functions(module_type):
         from common.utils import upload_base64_to_cloud
         import os
         from config import GENERATED_DIR, UPLOADS_DIR, JOBS_DIR
-        from concurrent.futures import ThreadPoolExecutor
         
         def save_signature_dataurl_cleaning(dataurl, uploads_dir, prefix="signature"):
             """Save signature for cleaning module"""
@@ -117,10 +116,8 @@ def get_module_functions(module_type):
         
         def get_paths_cleaning():
             """Get paths for cleaning module"""
-            executor = current_app.config.get('EXECUTOR') if current_app else None
-            if not executor:
-                executor = ThreadPoolExecutor(max_workers=2)
-            return GENERATED_DIR, UPLOADS_DIR, JOBS_DIR, executor
+            # The app's bounded executor; callers report an error when it is missing
+            return GENERATED_DIR, UPLOADS_DIR, JOBS_DIR, current_app.config.get('EXECUTOR')
         
         from module_cleaning.routes import process_job
         return save_signature_dataurl_cleaning, get_paths_cleaning, process_job
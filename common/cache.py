@@ -12,18 +12,24 @@ logger = logging.getLogger(__name__)
 
 def get_redis_connection():
     """
-    Get Redis connection from app config
+    Get a Redis client on the app's shared connection pool (app.extensions['redis_pool'],
+    created by create_app and also used by the rate limiter)
     
     Returns:
         redis.Redis instance or None if not configured
     """
     try:
-        redis_url = current_app.config.get('REDIS_URL')
-        if not redis_url:
-            return None
+        pool = current_app.extensions.get('redis_pool')
+        if pool is None:
+            redis_url = current_app.config.get('REDIS_URL')
+            if not redis_url:
+                return None
+            import redis
+            pool = current_app.extensions.setdefault('redis_pool', redis.ConnectionPool.from_url(redis_url))
         
         import redis
-        return redis.from_url(redis_url, decode_responses=True)
+        # Responses are bytes (the pool is shared with the limiter); json.loads accepts bytes
+        return redis.Redis(connection_pool=pool)
     except Exception as e:
         logger.warning(f"Redis connection failed: {e}")
         return None
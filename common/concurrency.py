@@ -0,0 +1,100 @@
+"""
+Per-user cap on report jobs in flight, shared by every gunicorn worker through Redis
+"""
+import logging
+import os
+import time
+
+from flask import current_app, g
+
+from common.cache import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# One sorted set per user: member = random request id, score = time the slot was taken.
+# Slots older than the window are dropped first, so a job whose worker died (and never
+# released) stops counting after REPORT_SLOT_TIMEOUT seconds.
+_ACQUIRE_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+if redis.call('ZCARD', key) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('EXPIRE', key, math.ceil(window))
+return 1
+"""
+
+
+class ReportSlot:
+    """
+    A taken slot. ``attach(future)`` hands it to the submitted job, which releases it when
+    done; a slot never attached is released when the request ends (release_pending_report_slots).
+    """
+
+    def __init__(self, redis_conn=None, key=None, request_id=None):
+        self._redis = redis_conn
+        self._key = key
+        self._request_id = request_id
+        self.attached = False
+
+    def attach(self, future):
+        self.attached = True
+        future.add_done_callback(self.release)
+
+    def release(self, _future=None):
+        if self._redis is None:
+            return
+        try:
+            self._redis.zrem(self._key, self._request_id)
+        except Exception as e:
+            logger.warning(f"Report slot release failed (expires on its own): {e}")
+        self._redis = None
+
+
+def acquire_report_slot(user_id=None):
+    """
+    Take one of the user's report-generation slots.
+
+    Returns a ReportSlot, or None when the user already has REPORT_JOBS_PER_USER jobs
+    in flight. Anonymous submissions are not capped (there is no trustworthy per-client
+    key behind the proxy). Without Redis (or when it errors) the request is let through:
+    the executor's own queue bound still applies.
+    """
+    limit = current_app.config.get('REPORT_JOBS_PER_USER', 5)
+    if not limit or not user_id:
+        return ReportSlot()
+    redis_conn = get_redis_connection()
+    if redis_conn is None:
+        return ReportSlot()
+
+    key = f"injaaz:report_slots:{user_id}"
+    request_id = os.urandom(4).hex()
+    window = current_app.config.get('REPORT_SLOT_TIMEOUT', 900)
+    try:
+        script = current_app.extensions.get('report_slot_script')
+        if script is None:
+            # register_script runs EVALSHA, loading the script on the first NOSCRIPT
+            script = current_app.extensions.setdefault(
+                'report_slot_script', redis_conn.register_script(_ACQUIRE_SCRIPT)
+            )
+        taken = script(keys=[key], args=[time.time(), window, limit, request_id], client=redis_conn)
+    except Exception as e:
+        logger.warning(f"⚠️ Report slot check skipped (Redis error): {e}")
+        return ReportSlot()
+
+    if not taken:
+        logger.info(f"Report job limit reached for {key}")
+        return None
+    slot = ReportSlot(redis_conn, key, request_id)
+    g.setdefault('report_slots', []).append(slot)
+    return slot
+
+
+def release_pending_report_slots(exc=None):
+    """teardown_request hook: release slots taken by a request that returned or raised before submitting its job"""
+    for slot in g.pop('report_slots', ()):
+        if not slot.attached:
+            slot.release()
@@ -6,6 +6,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Placeholder secrets shipped in config.py / .env.example / older docs
+WEAK_SECRET_KEYS = frozenset({'dev-secret', 'dev-secret-change-in-production', 'change-me', 'change-me-in-production'})
+WEAK_JWT_SECRET_KEYS = frozenset({'change-me', 'change-me-jwt-secret'})
+
 
 def validate_config(app):
     """
@@ -26,13 +30,13 @@ def validate_config(app):
     if flask_env == 'production':
         # Secret keys
         secret_key = app.config.get('SECRET_KEY')
-        if not secret_key or secret_key in ['dev-secret', 'dev-secret-change-in-production', 'change-me', 'change-me-in-production']:
+        if not secret_key or secret_key in WEAK_SECRET_KEYS:
             errors.append("SECRET_KEY not set or using default value in production")
         elif len(secret_key) < 32:
             errors.append(f"SECRET_KEY too short (min 32 characters, got {len(secret_key)})")
         
         jwt_secret_key = app.config.get('JWT_SECRET_KEY')
-        if not jwt_secret_key or jwt_secret_key in ['change-me', 'change-me-jwt-secret']:
+        if not jwt_secret_key or jwt_secret_key in WEAK_JWT_SECRET_KEYS:
             errors.append("JWT_SECRET_KEY not set or using default value in production")
         
         # Database URL - REQUIRED in production
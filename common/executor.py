@@ -0,0 +1,81 @@
+"""
+Bounded background executor for report generation jobs
+"""
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor with a cap on jobs waiting for a worker.
+
+    The stock executor queues without limit, so a burst of submissions keeps every
+    job (and the request payload it references) in memory until a worker frees up.
+    Here at most ``max_workers + max_queue_size`` jobs are in flight; past that the
+    job runs synchronously in the submitting thread (caller-runs), which slows the
+    submitting request down instead of growing the backlog.
+
+    ``submit`` always returns a Future, so callers using ``add_done_callback`` or
+    ``result()`` work the same either way.
+    """
+
+    def __init__(self, max_workers=None, max_queue_size=64, thread_name_prefix=''):
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._max_queue_size = max_queue_size
+        self._max_in_flight = self._max_workers + max_queue_size
+        self._in_flight = 0
+        self._caller_runs = 0
+        self._slots_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._slots_lock:
+            has_slot = self._in_flight < self._max_in_flight
+            if has_slot:
+                self._in_flight += 1
+            else:
+                self._caller_runs += 1
+
+        if not has_slot:
+            logger.warning(
+                f"⚠️ Background queue full ({self._max_queue_size} waiting) - "
+                f"running {getattr(fn, '__name__', fn)} in the request thread"
+            )
+            return self._run_in_caller(fn, args, kwargs)
+
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release_slot()
+            raise
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, _future=None):
+        with self._slots_lock:
+            self._in_flight -= 1
+
+    @staticmethod
+    def _run_in_caller(fn, args, kwargs):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def stats(self):
+        """Snapshot of pool usage (for /health)"""
+        with self._slots_lock:
+            in_flight = self._in_flight
+            caller_runs = self._caller_runs
+        return {
+            'workers': self._max_workers,
+            'active': min(in_flight, self._max_workers),
+            'queued': max(0, in_flight - self._max_workers),
+            'max_queue': self._max_queue_size,
+            'caller_runs': caller_runs,
+        }
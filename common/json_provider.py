@@ -0,0 +1,52 @@
+"""
+orjson-backed JSON provider for Flask (jsonify, request.get_json, tojson)
+"""
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Drop-in replacement for Flask's default provider that encodes with orjson.
+
+    Encodes the same values as the stdlib provider: keys sorted, datetimes/dates as
+    HTTP dates, Decimal/UUID/dataclasses through Flask's own ``default``. Non-ASCII
+    text is written as UTF-8 rather than escaped. Anything orjson rejects (ints
+    beyond 64 bits, explicit dump kwargs, pretty printing in debug) falls back to
+    the stdlib encoder.
+    """
+
+    def _orjson_options(self):
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        try:
+            return orjson.dumps(obj, default=self.default, option=self._orjson_options()).decode()
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        config = self._app.config
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        if pretty or config.get("JSONIFY_PRETTYPRINT_REGULAR") or config.get("JSONIFY_MIMETYPE"):
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(
+                obj, default=self.default,
+                option=self._orjson_options() | orjson.OPT_APPEND_NEWLINE,
+            )
+        except orjson.JSONEncodeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body, mimetype=self.mimetype)
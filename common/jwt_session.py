@@ -3,6 +3,8 @@ Ensure `sessions` rows exist for valid access JWTs (JTI).
 Used by JWT blocklist + token_required so behavior stays consistent.
 """
 import logging
+import threading
+import time
 from datetime import datetime
 
 from sqlalchemy.exc import IntegrityError
@@ -16,6 +18,8 @@ def sync_access_session_row(jti, jwt_payload):
     """
     Return the Session row for this access token JTI, creating it if missing.
     Returns None if the token cannot be backed (invalid sub, inactive user, refresh token, etc.).
+    A database error while creating the row is logged and re-raised, so callers can tell it
+    apart from a token that cannot be backed.
     """
     if not jti or jwt_payload.get('type') == 'refresh':
         return None
@@ -45,4 +49,99 @@ def sync_access_session_row(jti, jwt_payload):
     except Exception as e:
         db.session.rollback()
         logger.warning("sync_access_session_row failed for jti=%s: %s", jti, e)
-        return None
+        raise
+
+
+class RevocationCache:
+    """
+    Process-local cache of "is this access token revoked?" answers, keyed by JTI.
+
+    Every authenticated request used to read its `sessions` row; almost all of those
+    reads say "not revoked". A "not revoked" answer is kept for `ttl` seconds, a
+    revoked answer given the token's exp until the token itself expires (a revoked
+    session is never undone), any other revoked answer for `ttl` seconds.
+    Logout / password change call `forget` / `forget_user` so this process sees the
+    revocation at once; other workers see it within `ttl` seconds.
+    """
+
+    def __init__(self, ttl=30, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = {}  # jti -> (revoked, user_id, expires_at monotonic)
+        self._lock = threading.Lock()
+
+    def get(self, jti):
+        """Cached answer for jti, or None when unknown/expired"""
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None:
+                return None
+            if entry[2] <= time.monotonic():
+                del self._entries[jti]
+                return None
+            return entry[0]
+
+    def set(self, jti, revoked, user_id=None, token_exp=None):
+        now = time.monotonic()
+        ttl = self.ttl
+        if revoked and token_exp:
+            ttl = max(ttl, token_exp - time.time())
+        with self._lock:
+            if len(self._entries) >= self.maxsize and jti not in self._entries:
+                self._evict(now)
+            self._entries[jti] = (revoked, user_id, now + ttl)
+
+    def forget(self, jti):
+        with self._lock:
+            self._entries.pop(jti, None)
+
+    def forget_user(self, user_id):
+        """Drop every cached answer for a user's tokens (bulk revoke)"""
+        user_id = str(user_id)
+        with self._lock:
+            for jti in [k for k, v in self._entries.items() if v[1] == user_id]:
+                del self._entries[jti]
+
+    def _evict(self, now):
+        # Drop expired entries; if still full, drop the oldest inserted
+        for jti in [k for k, v in self._entries.items() if v[2] <= now]:
+            del self._entries[jti]
+        if len(self._entries) >= self.maxsize:
+            del self._entries[next(iter(self._entries))]
+
+
+revocation_cache = RevocationCache()
+
+
+def is_access_token_revoked(jti, jwt_payload):
+    """
+    True if the access token must be rejected: session revoked, or no session row can
+    be backed for it (unknown/inactive user). Answers are cached per JTI.
+    """
+    if not jti:
+        return True
+    cached = revocation_cache.get(jti)
+    if cached is not None:
+        return cached
+
+    user_id = str(jwt_payload.get('sub'))
+    session = Session.query.filter_by(token_jti=jti).first()
+    if session is None:
+        try:
+            session = sync_access_session_row(jti, jwt_payload)
+        except Exception:
+            # Transient DB error: reject this request, cache nothing so the next one retries
+            return True
+    if session is None:
+        logger.warning(
+            "JWT blocklist: missing session for jti=%s sub=%s — token treated as revoked",
+            jti,
+            jwt_payload.get('sub'),
+        )
+        # Not a confirmed revocation (the user may be reactivated): keep it for ttl only
+        revocation_cache.set(jti, True, user_id)
+        return True
+
+    revoked = bool(session.is_revoked)
+    revocation_cache.set(jti, revoked, user_id, jwt_payload.get('exp'))
+    return revoked
@@ -3,7 +3,7 @@ Security utilities: rate limiting, CSRF protection, input sanitization
 """
 import os
 import re
-from functools import wraps
+from functools import lru_cache, wraps
 from flask import request, jsonify, current_app
 from werkzeug.security import safe_join
 import logging
@@ -39,6 +39,7 @@ def sanitize_filename(filename):
     
     return filename or 'unnamed_file'
 
+@lru_cache(maxsize=1024)
 def safe_path_join(base_dir, *paths):
     """
     Safely join paths and ensure result is within base_dir
@@ -49,6 +50,9 @@ def safe_path_join(base_dir, *paths):
         
     Returns:
         Absolute path within base_dir or raises ValueError
+
+    Pure string work (no filesystem access), so results are memoized: repeat downloads
+    of the same file skip the sanitizing. Rejected paths raise and are not cached.
     """
     # Join all paths first, then split and sanitize each component
     # This allows paths like 'uploads/filename' to work correctly
@@ -71,11 +75,12 @@ def safe_path_join(base_dir, *paths):
     if result is None:
         raise ValueError(f"Path traversal detected: {paths}")
     
-    # Double-check result is within base_dir
+    # Double-check result is within base_dir (commonpath: a sibling such as
+    # "generated_old" is not inside "generated", which a startswith check let through)
     result_abs = os.path.abspath(result)
     base_abs = os.path.abspath(base_dir)
     
-    if not result_abs.startswith(base_abs):
+    if os.path.commonpath((result_abs, base_abs)) != base_abs:
         raise ValueError(f"Path {result} is outside base directory {base_dir}")
     
     return result_abs
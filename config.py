@@ -13,6 +13,11 @@ GENERATED_DIR = os.path.abspath(_gen_override) if _gen_override else os.path.joi
 UPLOADS_DIR = os.path.join(GENERATED_DIR, "uploads")
 JOBS_DIR = os.path.join(GENERATED_DIR, "jobs")
 
+# Behind Nginx: set to an `internal` location that aliases GENERATED_DIR (e.g. /_protected_generated)
+# and /generated/<file> responds with X-Accel-Redirect so Nginx streams the file itself.
+# See docs/OCI_DEPLOYMENT.md. Unset = Flask streams the file (development).
+GENERATED_ACCEL_REDIRECT = (os.getenv("GENERATED_ACCEL_REDIRECT") or "").strip() or None
+
 # simple limits
 # Standardized file upload limits (10MB for all modules)
 MAX_UPLOAD_FILESIZE = 10 * 1024 * 1024  # 10MB per file
@@ -53,6 +58,38 @@ if DATABASE_URL and DATABASE_URL.startswith("postgres://"):
 FLASK_ENV = os.getenv("FLASK_ENV", "development")
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
+# Create the default admin user while the app starts (every worker, every boot). Off outside
+# development: deployments run `flask --app Injaaz init-admin` once before starting gunicorn.
+BOOTSTRAP_ADMIN = os.getenv("BOOTSTRAP_ADMIN", "true" if FLASK_ENV == "development" else "false").lower() == "true"
+
+# Create missing tables/columns and seed sample DocHub documents while the app starts. Off outside
+# development: deployments run `flask --app Injaaz init-db` once before starting gunicorn.
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "true" if FLASK_ENV == "development" else "false").lower() == "true"
+
+# Browser cache lifetime (seconds) for /static assets, favicon and manifest.
+# Static URLs are not fingerprinted, so keep it short enough that a deploy reaches users.
+# Default: 1 hour in production; development revalidates on every request.
+_static_max_age = os.getenv("STATIC_MAX_AGE")
+SEND_FILE_MAX_AGE_DEFAULT = int(_static_max_age) if _static_max_age else (3600 if FLASK_ENV == "production" else None)
+
+# Response compression (Flask-Compress): dynamic JSON/HTML only. Streamed responses (static files,
+# generated reports, DocHub downloads) are never buffered for compression.
+COMPRESS_MIMETYPES = ['text/html', 'application/json', 'text/css', 'application/javascript']
+COMPRESS_LEVEL = 4
+COMPRESS_MIN_SIZE = 500
+COMPRESS_STREAMS = False
+
+# Background report jobs (PDF/Excel generation). One worker thread by default: each running job
+# holds its images and document buffers, which is what fits the 512MB free tier. Raise
+# EXECUTOR_MAX_WORKERS on larger instances. At most EXECUTOR_MAX_QUEUE jobs wait for a worker;
+# past that a job runs in the request that submitted it, so the backlog cannot grow without bound.
+EXECUTOR_MAX_WORKERS = max(1, int(os.getenv("EXECUTOR_MAX_WORKERS", 1)))
+EXECUTOR_MAX_QUEUE = int(os.getenv("EXECUTOR_MAX_QUEUE", 32))
+# Report jobs one user may have in flight across all workers (Redis; 0 = no cap). A slot not
+# released within REPORT_SLOT_TIMEOUT seconds (worker killed mid-job) stops counting.
+REPORT_JOBS_PER_USER = int(os.getenv("REPORT_JOBS_PER_USER", 5))
+REPORT_SLOT_TIMEOUT = int(os.getenv("REPORT_SLOT_TIMEOUT", 900))
+
 # REDIS (for rate limiting and background tasks)
 # Strip whitespace — common copy/paste issue from Render/Upstash dashboards
 _redis = (os.getenv("REDIS_URL") or "").strip()
@@ -85,6 +122,12 @@ JWT_REFRESH_COOKIE_NAME = 'refresh_token_cookie'
 # The SPA uses Authorization: Bearer from localStorage; cookies are a fallback. Default off; set
 # JWT_COOKIE_CSRF_PROTECT=true in env only if you add CSRF headers to all API calls.
 JWT_COOKIE_CSRF_PROTECT = os.getenv("JWT_COOKIE_CSRF_PROTECT", "false").lower() == "true"
+# Seconds a "not revoked" answer for an access token is cached per worker (saves a sessions
+# query per request). Logout takes effect at once in the same worker, within this window in others.
+JWT_REVOCATION_CACHE_TTL = int(os.getenv("JWT_REVOCATION_CACHE_TTL", 30))
+
+# Seconds /health reuses its last database check (probes from load balancers / uptime monitors)
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", 2))
 
 # EMAIL (Optional - for HVAC module email reports)
 MAIL_SERVER = os.getenv("MAIL_SERVER")
@@ -119,8 +162,11 @@ SQLALCHEMY_ENGINE_OPTIONS = {
 } if _use_sqlite else {
     'pool_pre_ping': True,           # Check connections before using
     'pool_recycle': 300,             # Recycle connections every 5 minutes
-    'pool_size': 5,                  # Number of connections to maintain (reduced for free tier)
-    'max_overflow': 10,              # Maximum overflow connections (reduced for free tier)
+    'pool_size': int(os.getenv("DB_POOL_SIZE", 5)),         # Connections kept per worker (reduced for free tier)
+    'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", 10)),  # Extra connections under load (reduced for free tier)
     'pool_timeout': 30,              # Timeout for getting connection from pool
+    'connect_args': {                # Fail a new connection after this many seconds (boot check included)
+        'connect_timeout': int(os.getenv("DB_CONNECT_TIMEOUT", 5)),
+    },
     'echo': False,                   # Don't log all SQL queries (set to True for debugging)
 }
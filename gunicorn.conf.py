@@ -0,0 +1,51 @@
+# Gunicorn settings, picked up automatically by `gunicorn wsgi:app` from the project root.
+# Every value can be overridden per deployment through environment variables.
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# One worker by default: each worker holds its own report executor and pandas/reportlab
+# imports, which is what fits the 512MB free tier. Scale with WEB_CONCURRENCY.
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Report generation and large downloads can take minutes
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '300'))
+
+# Heartbeat file in RAM instead of the container's (possibly slow, overlay) disk
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+# GUNICORN_PRELOAD=true: build the app once in the master and fork workers from it, so
+# imported modules, templates, blueprints and the URL map are built once and shared
+# copy-on-write (worth it with WEB_CONCURRENCY > 1). Schema and admin setup are not part
+# of boot in production: `flask --app Injaaz init-db` does them before gunicorn starts
+# (AUTO_MIGRATE / BOOTSTRAP_ADMIN re-enable them at boot, which with preload runs them in
+# the master). Per-process state is reset in post_fork below.
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
+
+
+def when_ready(server):
+    """Preload: stop the MMR scheduler create_app started in the master; each worker starts its own"""
+    if not preload_app:
+        return
+    from module_mmr.scheduler import stop_scheduler
+    stop_scheduler()
+
+
+def post_fork(server, worker):
+    """
+    Preload: give the worker its own resources instead of the master's copies. DB connections
+    are dropped (a socket must not be shared across processes) and the MMR scheduler is
+    started here, since threads do not survive fork. The report executor and Redis clients
+    create their threads/connections on first use, so they need nothing.
+    """
+    if not preload_app:
+        return
+    from app.models import db
+    from module_mmr.scheduler import init_scheduler
+    flask_app = server.app.wsgi()
+    with flask_app.app_context():
+        db.engine.dispose(close=False)
+    init_scheduler(flask_app)
@@ -11,6 +11,7 @@ from app.middleware import token_required
 from flask_jwt_extended import get_jwt_identity, jwt_required
 from app.services.cloudinary_service import upload_local_file
 from common.error_responses import error_response, success_response
+from common.concurrency import acquire_report_slot
 
 # Rate limiting helper
 def get_limiter():
@@ -494,6 +495,11 @@ def submit():
             pass  # No token or invalid token - submission will be anonymous
     except Exception:
         pass  # JWT not available
+
+    # Cap this user's report jobs in flight (counted across all workers)
+    report_slot = acquire_report_slot(user_id)
+    if report_slot is None:
+        return error_response('Too many reports in progress - please wait for one to finish', status_code=429, error_code='TOO_MANY_JOBS')
     
     submission = create_submission_db(
         module_type='civil',
@@ -549,7 +555,8 @@ def submit():
                 logger.exception(f"Report generation failed: {e}")
                 fail_job_db(job_id_local, str(e))
 
-    EXECUTOR.submit(task_generate_reports, job_id, sub_id, request.host_url.rstrip('/'), current_app._get_current_object())
+    future = EXECUTOR.submit(task_generate_reports, job_id, sub_id, request.host_url.rstrip('/'), current_app._get_current_object())
+    report_slot.attach(future)
     return jsonify({"status": "queued", "job_id": job_id, "submission_id": sub_id, "files": saved_files})
 
 @civil_bp.route('/status/<job_id>', methods=['GET'])
@@ -928,6 +935,11 @@ def submit_with_urls():
             logger.debug(f"JWT verification error: {e}")
             pass  # JWT not available
         
+        # Cap this user's report jobs in flight (counted across all workers)
+        report_slot = acquire_report_slot(user_id)
+        if report_slot is None:
+            return error_response('Too many reports in progress - please wait for one to finish', status_code=429, error_code='TOO_MANY_JOBS')
+        
         submission = create_submission_db(
             module_type='civil',
             form_data=submission_data,
@@ -964,6 +976,7 @@ def submit_with_urls():
                     logger.error(traceback.format_exc())
             
             future.add_done_callback(log_exception)
+            report_slot.attach(future)
             logger.info(f"✅ Background job {job_id} submitted to executor")
         else:
             logger.error("ThreadPoolExecutor not found in app config")
@@ -22,6 +22,7 @@ from common.db_utils import (
     get_submission_db
 )
 from common.error_responses import error_response, success_response
+from common.concurrency import acquire_report_slot
 from app.models import db, User
 from app.middleware import token_required
 from flask_jwt_extended import get_jwt_identity, jwt_required
@@ -672,6 +673,11 @@ def submit():
         except Exception:
             pass  # JWT not available
         
+        # Cap this user's report jobs in flight (counted across all workers)
+        report_slot = acquire_report_slot(user_id)
+        if report_slot is None:
+            return error_response('Too many reports in progress - please wait for one to finish', status_code=429, error_code='TOO_MANY_JOBS')
+        
         # Create submission in database
         submission = create_submission_db(
             module_type='cleaning',
@@ -695,13 +701,14 @@ def submit():
         # Submit background job with submission_id
         executor = current_app.config.get('EXECUTOR')
         if executor:
-            executor.submit(
+            future = executor.submit(
                 process_job, 
                 submission_id, 
                 job_id, 
                 current_app.config,
                 current_app._get_current_object()
             )
+            report_slot.attach(future)
             logger.info(f"Job {job_id} submitted to executor")
         else:
             logger.error("ThreadPoolExecutor not found in app config")
@@ -894,6 +901,11 @@ def submit_with_urls():
         except Exception:
             pass  # No token or invalid token - submission will be anonymous
         
+        # Cap this user's report jobs in flight (counted across all workers)
+        report_slot = acquire_report_slot(user_id)
+        if report_slot is None:
+            return error_response('Too many reports in progress - please wait for one to finish', status_code=429, error_code='TOO_MANY_JOBS')
+        
         # Save submission to database - pass data directly as form_data (matches Civil/HVAC structure)
         submission_db = create_submission_db(
             module_type='cleaning',
@@ -930,6 +942,7 @@ def submit_with_urls():
                     logger.error(traceback.format_exc())
             
             future.add_done_callback(log_exception)
+            report_slot.attach(future)
             logger.info(f"✅ Background job {job_id} submitted to executor")
         else:
             logger.error("ThreadPoolExecutor not found in app config")
@@ -23,6 +23,7 @@ from common.utils import (
     is_path_safe_for_directory,
 )
 from common.error_responses import error_response, success_response
+from common.concurrency import acquire_report_slot
 from common.db_utils import (
     create_submission_db,
     create_job_db,
@@ -87,11 +88,6 @@ DEFAULT_GENERATED_DIR = os.path.join(BASE_DIR, "generated")
 DEFAULT_UPLOADS_DIR = os.path.join(DEFAULT_GENERATED_DIR, "uploads")
 DEFAULT_JOBS_DIR = os.path.join(DEFAULT_GENERATED_DIR, "jobs")
 
-# fallback executor for background tasks (used if app doesn't provide one)
-from concurrent.futures import ThreadPoolExecutor
-
-_FALLBACK_EXECUTOR = ThreadPoolExecutor(max_workers=2)
-
 hvac_mep_bp = Blueprint(
     "hvac_mep_bp", __name__, template_folder="templates", static_folder="static"
 )
@@ -117,11 +113,8 @@ def get_paths():
         if current_app
         else DEFAULT_JOBS_DIR
     )
-    executor = (
-        current_app.config.get("EXECUTOR")
-        if (current_app and current_app.config.get("EXECUTOR"))
-        else _FALLBACK_EXECUTOR
-    )
+    # The app's bounded executor; callers report an error when it is missing
+    executor = current_app.config.get("EXECUTOR") if current_app else None
     return gen, uploads, jobs, executor
 
 
@@ -739,6 +732,11 @@ def submit():
             logger.debug(f"JWT verification error: {e}")
             pass  # JWT not available
         
+        # Cap this user's report jobs in flight (counted across all workers)
+        report_slot = acquire_report_slot(user_id)
+        if report_slot is None:
+            return error_response('Too many reports in progress - please wait for one to finish', status_code=429, error_code='TOO_MANY_JOBS')
+        
         submission = create_submission_db(
             module_type='hvac_mep',
             form_data=submission_record,
@@ -775,6 +773,7 @@ def submit():
                     logger.error(traceback.format_exc())
             
             future.add_done_callback(log_exception)
+            report_slot.attach(future)
             logger.info(f"✅ Background job {job_id} submitted to executor")
         else:
             logger.error("ThreadPoolExecutor not found in app config")
@@ -1248,6 +1247,11 @@ def submit_with_urls():
             logger.debug(f"JWT verification error: {e}")
             pass  # JWT not available
         
+        # Cap this user's report jobs in flight (counted across all workers)
+        report_slot = acquire_report_slot(user_id)
+        if report_slot is None:
+            return error_response('Too many reports in progress - please wait for one to finish', status_code=429, error_code='TOO_MANY_JOBS')
+        
         # Handle edit vs new submission
         if is_edit_mode:
             from common.db_utils import update_submission_db
@@ -1310,6 +1314,7 @@ def submit_with_urls():
                     logger.error(traceback.format_exc())
             
             future.add_done_callback(log_exception)
+            report_slot.attach(future)
             logger.info(f"✅ Background job {job_id} submitted to executor")
         else:
             logger.error("ThreadPoolExecutor not found in app config")
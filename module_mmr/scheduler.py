@@ -290,6 +290,15 @@ def init_scheduler(app):
     logger.info('MMR APScheduler started')
 
 
+def stop_scheduler():
+    """Stop the scheduler so init_scheduler() starts a fresh one (gunicorn preload: master → workers)."""
+    global _scheduler
+
+    if _scheduler and _scheduler.running:
+        _scheduler.shutdown(wait=False)
+    _scheduler = None
+
+
 def update_schedule(config: dict, app):
     """Called after the admin saves email config – refreshes the cron job."""
     global _scheduler
@@ -4,22 +4,25 @@ Pytest fixtures for Injaaz application testing
 import pytest
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+# Testing environment, set when conftest is imported: before any test module is collected,
+# so a test file importing Injaaz/config at module level still gets the in-memory database
+# (config.py otherwise falls back to the developer's ./injaaz.db)
+os.environ['FLASK_ENV'] = 'testing'
+os.environ['TESTING'] = 'true'
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+os.environ['SECRET_KEY'] = 'test-secret-key-for-testing'
+os.environ['JWT_SECRET_KEY'] = 'test-jwt-secret-key-for-testing'
+
+
 @pytest.fixture(scope='session')
 def app():
     """Create test application"""
-    # Set testing environment variables before importing app
-    os.environ['FLASK_ENV'] = 'testing'
-    os.environ['TESTING'] = 'true'
-    os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
-    os.environ['SECRET_KEY'] = 'test-secret-key-for-testing'
-    os.environ['JWT_SECRET_KEY'] = 'test-jwt-secret-key-for-testing'
-    
     from Injaaz import create_app
     from app.models import db
     
@@ -29,13 +32,17 @@ def app():
         'SQLALCHEMY_DATABASE_URI': 'sqlite:///:memory:',
         'WTF_CSRF_ENABLED': False,
         'JWT_SECRET_KEY': 'test-jwt-secret-key',
-        'JWT_ACCESS_TOKEN_EXPIRES': False,  # No expiry for tests
+        # Long enough for any test; login reads the token's exp, so it must not be False
+        'JWT_ACCESS_TOKEN_EXPIRES': timedelta(hours=1),
     })
     
     with app.app_context():
         db.create_all()
         yield app
         db.drop_all()
+        # Close pooled connections and stop the app's report executor at session end
+        db.engine.dispose()
+    app.config['EXECUTOR'].shutdown(wait=False)
 
 
 @pytest.fixture(scope='function')
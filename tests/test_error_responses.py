@@ -0,0 +1,18 @@
+def test_unknown_api_path_gets_json_404(client):
+    response = client.get('/api/does-not-exist')
+    assert response.status_code == 404
+    assert response.is_json
+    assert response.get_json()['error'] == 'Resource not found'
+
+
+def test_unknown_page_containing_api_segment_gets_html_404(client):
+    response = client.get('/static/docs/api/does-not-exist')
+    assert response.status_code == 404
+    assert not response.is_json
+
+
+def test_module_api_auth_failure_is_json_401(client):
+    response = client.get('/admin/mmr/api/current-upload')
+    assert response.status_code == 401
+    assert response.is_json
+    assert response.get_json()['success'] is False
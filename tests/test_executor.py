@@ -0,0 +1,40 @@
+import threading
+
+from common.executor import BoundedThreadPoolExecutor
+
+
+def test_submit_runs_in_caller_when_workers_and_queue_are_full():
+    executor = BoundedThreadPoolExecutor(max_workers=1, max_queue_size=1)
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocked():
+        started.set()
+        release.wait(5)
+        return threading.get_ident()
+
+    try:
+        running = executor.submit(blocked)
+        assert started.wait(5)
+        waiting = executor.submit(blocked)
+        assert executor.stats() == {
+            'workers': 1, 'active': 1, 'queued': 1, 'max_queue': 1, 'caller_runs': 0,
+        }
+
+        overflow = executor.submit(threading.get_ident)
+        assert overflow.done()
+        assert overflow.result() == threading.get_ident()
+        assert executor.stats()['caller_runs'] == 1
+
+        failing = executor.submit(lambda: 1 / 0)
+        assert isinstance(failing.exception(), ZeroDivisionError)
+        assert executor.stats()['caller_runs'] == 2
+    finally:
+        release.set()
+        executor.shutdown(wait=True)
+
+    assert running.result() != threading.get_ident()
+    assert waiting.result() != threading.get_ident()
+    stats = executor.stats()
+    assert stats['active'] == 0
+    assert stats['queued'] == 0
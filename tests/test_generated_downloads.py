@@ -0,0 +1,72 @@
+import os
+import uuid
+
+import pytest
+
+
+@pytest.fixture
+def generated_file(app):
+    name = f"test_download_{uuid.uuid4().hex}.pdf"
+    path = os.path.join(app.config['GENERATED_DIR'], name)
+    with open(path, 'wb') as f:
+        f.write(b"0123456789" * 100)
+    yield name
+    os.remove(path)
+
+
+def test_download_full_file(client, generated_file):
+    response = client.get(f'/generated/{generated_file}')
+    assert response.status_code == 200
+    assert response.headers['Accept-Ranges'] == 'bytes'
+    assert response.headers['Content-Disposition'] == f'inline; filename={generated_file}'
+    assert len(response.get_data()) == 1000
+    response.close()
+
+
+def test_download_range_resumes(client, generated_file):
+    response = client.get(f'/generated/{generated_file}', headers={'Range': 'bytes=990-'})
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == 'bytes 990-999/1000'
+    assert response.get_data() == b"0123456789"
+    response.close()
+
+
+def test_download_not_modified(client, generated_file):
+    first = client.get(f'/generated/{generated_file}')
+    etag = first.headers['ETag']
+    first.close()
+    response = client.get(f'/generated/{generated_file}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b""
+
+
+def test_download_modified_etag_sends_file(client, generated_file):
+    response = client.get(f'/generated/{generated_file}', headers={'If-None-Match': '"stale"'})
+    assert response.status_code == 200
+    assert len(response.get_data()) == 1000
+    response.close()
+
+
+def test_download_traversal_stays_in_generated_dir(client, generated_file):
+    # '..' components are dropped, not followed: the lookup never leaves GENERATED_DIR
+    assert client.get('/generated/../config.py').status_code == 404
+    assert client.get('/generated/..%2F..%2Fconfig.py').status_code == 404
+    response = client.get(f'/generated/../{generated_file}')
+    assert response.status_code == 200
+    assert len(response.get_data()) == 1000
+    response.close()
+
+
+def test_download_missing_file(client):
+    assert client.get('/generated/missing-file.pdf').status_code == 404
+
+
+def test_download_accel_redirect(app, client, generated_file, monkeypatch):
+    monkeypatch.setitem(app.config, 'GENERATED_ACCEL_REDIRECT', '/_protected_generated/')
+    response = client.get(f'/generated/{generated_file}')
+    assert response.status_code == 200
+    assert response.headers['X-Accel-Redirect'] == f'/_protected_generated/{generated_file}'
+    assert response.headers['Content-Type'] == 'application/pdf'
+    assert response.headers['Content-Disposition'] == f'inline; filename={generated_file}'
+    assert response.get_data() == b""
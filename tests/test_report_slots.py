@@ -0,0 +1,85 @@
+from concurrent.futures import Future
+
+import pytest
+
+fakeredis = pytest.importorskip('fakeredis')
+
+from common.concurrency import acquire_report_slot
+
+
+@pytest.fixture
+def slot_redis(app, monkeypatch):
+    """Report slots on an in-process Redis (fakeredis with Lua), capped at 2 per user"""
+    server = fakeredis.FakeServer()
+    conn = fakeredis.FakeRedis(server=server)
+    monkeypatch.setitem(app.extensions, 'redis_pool', conn.connection_pool)
+    monkeypatch.delitem(app.extensions, 'report_slot_script', raising=False)
+    monkeypatch.setitem(app.config, 'REPORT_JOBS_PER_USER', 2)
+    return conn
+
+
+def _slots_in_use(conn, user_id):
+    return conn.zcard(f'injaaz:report_slots:{user_id}')
+
+
+def test_cap_reached_then_released_on_job_completion(app, slot_redis):
+    futures = [Future(), Future()]
+    with app.test_request_context():
+        for future in futures:
+            slot = acquire_report_slot('42')
+            assert slot is not None
+            slot.attach(future)
+        assert acquire_report_slot('42') is None
+        # Other users have their own slots
+        assert acquire_report_slot('43') is not None
+
+    # Attached slots stay taken after the request until their job finishes
+    assert _slots_in_use(slot_redis, '42') == 2
+    futures[0].set_result(None)
+    assert _slots_in_use(slot_redis, '42') == 1
+    futures[1].set_exception(RuntimeError('report failed'))
+    assert _slots_in_use(slot_redis, '42') == 0
+
+
+def test_unsubmitted_slot_released_at_request_end(app, slot_redis):
+    with app.test_request_context():
+        assert acquire_report_slot('42') is not None
+        assert _slots_in_use(slot_redis, '42') == 1
+    assert _slots_in_use(slot_redis, '42') == 0
+
+
+def test_anonymous_submissions_not_capped(app, slot_redis):
+    with app.test_request_context():
+        for _ in range(5):
+            assert acquire_report_slot(None) is not None
+    assert slot_redis.keys('injaaz:report_slots:*') == []
+
+
+def _submit(client, headers):
+    return client.post('/civil/submit-with-urls', headers=headers,
+                       json={'project_name': 'Tower A', 'location': 'Dubai', 'work_items': []})
+
+
+def test_submit_returns_429_at_cap(app, client, auth_headers, test_user, slot_redis):
+    key = f'injaaz:report_slots:{test_user.id}'
+    slot_redis.zadd(key, {'job-a': 9e12, 'job-b': 9e12})
+    response = _submit(client, auth_headers)
+    assert response.status_code == 429
+    assert response.get_json()['error_code'] == 'TOO_MANY_JOBS'
+
+
+def test_submit_failure_releases_slot(app, client, auth_headers, test_user, slot_redis, monkeypatch):
+    import module_civil.routes as civil_routes
+
+    def broken_create(**kwargs):
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setattr(civil_routes, 'create_submission_db', broken_create)
+    assert _submit(client, auth_headers).status_code == 500
+    assert _slots_in_use(slot_redis, test_user.id) == 0
+
+
+def test_submit_without_executor_releases_slot(app, client, auth_headers, test_user, slot_redis, monkeypatch):
+    monkeypatch.setitem(app.config, 'EXECUTOR', None)
+    assert _submit(client, auth_headers).status_code == 500
+    assert _slots_in_use(slot_redis, test_user.id) == 0
@@ -0,0 +1,119 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import common.jwt_session as jwt_session
+from common.jwt_session import RevocationCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Frozen monotonic/wall clocks for the cache; advance with clock.now += seconds"""
+    fake = SimpleNamespace(now=1000.0)
+    fake.monotonic = lambda: fake.now
+    fake.time = lambda: fake.now
+    monkeypatch.setattr(jwt_session, 'time', fake)
+    return fake
+
+
+def test_not_revoked_answer_expires_after_ttl(clock):
+    cache = RevocationCache(ttl=30)
+    cache.set('jti-1', False, '7', token_exp=clock.now + 3600)
+    clock.now += 29
+    assert cache.get('jti-1') is False
+    clock.now += 1
+    assert cache.get('jti-1') is None
+
+
+def test_revoked_answer_kept_until_token_exp(clock):
+    cache = RevocationCache(ttl=30)
+    cache.set('jti-1', True, '7', token_exp=clock.now + 600)
+    clock.now += 599
+    assert cache.get('jti-1') is True
+    clock.now += 1
+    assert cache.get('jti-1') is None
+
+
+def test_forget_user_clears_only_that_users_entries(clock):
+    cache = RevocationCache()
+    cache.set('a', False, '7')
+    cache.set('b', False, '7')
+    cache.set('c', False, '8')
+    cache.forget_user(7)
+    assert cache.get('a') is None
+    assert cache.get('b') is None
+    assert cache.get('c') is False
+
+
+def test_full_cache_evicts_oldest_entry_first(clock):
+    cache = RevocationCache(ttl=30, maxsize=2)
+    cache.set('a', False, '7')
+    cache.set('b', False, '7')
+    cache.set('c', False, '7')
+    assert cache.get('a') is None
+    assert cache.get('b') is False
+    assert cache.get('c') is False
+
+
+def test_full_cache_evicts_expired_entries_before_live_ones(clock):
+    cache = RevocationCache(ttl=30, maxsize=2)
+    cache.set('a', False, '7')
+    clock.now += 20
+    cache.set('b', True, '7', token_exp=clock.now + 600)
+    clock.now += 15  # 'a' has expired, 'b' has not
+    cache.set('c', False, '7')
+    assert cache.get('b') is True
+    assert cache.get('c') is False
+
+
+def test_logout_revokes_token_on_next_request(client, auth_headers):
+    assert client.get('/api/auth/me', headers=auth_headers).status_code == 200
+    assert client.post('/api/auth/logout', headers=auth_headers).status_code == 200
+    assert client.get('/api/auth/me', headers=auth_headers).status_code == 401
+
+
+def test_password_change_revokes_existing_token(client, auth_headers):
+    # Warm the cache with a "not revoked" answer first
+    assert client.get('/api/auth/me', headers=auth_headers).status_code == 200
+    response = client.post('/api/auth/change-password', headers=auth_headers, json={
+        'current_password': 'TestPass123',
+        'new_password': 'NewTestPass456',
+    })
+    assert response.status_code == 200
+    assert client.get('/api/auth/me', headers=auth_headers).status_code == 401
+
+
+def test_session_backfill_db_error_is_not_cached(app, test_user, monkeypatch):
+    from app.models import Session, db
+
+    payload = {'sub': str(test_user.id), 'type': 'access', 'exp': time.time() + 3600}
+    real_commit = db.session.commit
+    calls = []
+
+    def commit_fails_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OperationalError('INSERT INTO sessions', {}, Exception('database is locked'))
+        return real_commit()
+
+    with app.app_context():
+        monkeypatch.setattr(db.session, 'commit', commit_fails_once)
+        assert jwt_session.is_access_token_revoked('backfill-jti', payload) is True
+        assert jwt_session.revocation_cache.get('backfill-jti') is None
+
+        # The next request re-queries, backfills the row and accepts the token
+        assert jwt_session.is_access_token_revoked('backfill-jti', payload) is False
+        assert jwt_session.revocation_cache.get('backfill-jti') is False
+        Session.query.filter_by(token_jti='backfill-jti').delete()
+        real_commit()
+
+
+def test_unbacked_token_is_rejected_for_ttl_only(app, clock):
+    payload = {'sub': '999999', 'type': 'access', 'exp': clock.now + 3600}
+    with app.app_context():
+        assert jwt_session.is_access_token_revoked('unbacked-jti', payload) is True
+    assert jwt_session.revocation_cache.get('unbacked-jti') is True
+    clock.now += jwt_session.revocation_cache.ttl
+    assert jwt_session.revocation_cache.get('unbacked-jti') is None
@@ -0,0 +1,40 @@
+import Injaaz
+from sqlalchemy import inspect
+
+from app.models import db
+
+
+def _table_names():
+    return set(inspect(db.engine).get_table_names())
+
+
+def test_schema_rebuilt_when_database_recreated(app, tmp_path, monkeypatch):
+    fp_path = str(tmp_path / '.schema-test')
+    monkeypatch.setattr(Injaaz, '_schema_fingerprint_path', lambda database_url: fp_path)
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+    expected = {table.name for table in db.metadata.sorted_tables}
+
+    with app.app_context():
+        Injaaz._migrate_schema(url)
+        assert expected <= _table_names()
+        assert Injaaz._read_fingerprint(fp_path) == Injaaz._schema_fingerprint()
+
+        # Database dropped/recreated while the fingerprint file survives
+        db.drop_all()
+        assert not expected & _table_names()
+
+        Injaaz._migrate_schema(url)
+        assert expected <= _table_names()
+
+
+def test_schema_skipped_when_fingerprint_and_tables_match(app, tmp_path, monkeypatch):
+    fp_path = str(tmp_path / '.schema-test')
+    monkeypatch.setattr(Injaaz, '_schema_fingerprint_path', lambda database_url: fp_path)
+    url = app.config['SQLALCHEMY_DATABASE_URI']
+
+    with app.app_context():
+        Injaaz._migrate_schema(url)
+        calls = []
+        monkeypatch.setattr(Injaaz, '_ensure_schema', lambda: calls.append(1))
+        Injaaz._migrate_schema(url)
+        assert calls == []
@@ -0,0 +1,21 @@
+import importlib
+import sys
+
+import pytest
+
+import Injaaz
+
+
+class BadConfig(Exception):
+    pass
+
+
+def test_create_app_failure_fails_boot(monkeypatch):
+    """A broken Injaaz.create_app must not fall back to another candidate module"""
+    def broken_factory():
+        raise BadConfig('bad config')
+
+    monkeypatch.setattr(Injaaz, 'create_app', broken_factory)
+    monkeypatch.delitem(sys.modules, 'wsgi', raising=False)
+    with pytest.raises(BadConfig):
+        importlib.import_module('wsgi')
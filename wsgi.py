@@ -1,7 +1,8 @@
 # Resilient WSGI entrypoint for Gunicorn / Render.
 # Tries several common module/attribute combinations and:
 #  - If an attribute 'app' is found, uses it.
-#  - If a 'create_app' factory is found, calls it (no args).
+#  - If a 'create_app' factory is found, calls it (no args). Only an ImportError from the
+#    factory (or its module) moves on to the next candidate; any other error fails boot.
 # If nothing is found it raises a clear RuntimeError so logs show what to fix.
 
 import importlib
@@ -34,7 +35,7 @@ for module_name, attr in candidates:
     try:
         logger.info("Attempting to import %s and look for %s()", module_name, attr)
         mod = importlib.import_module(module_name)
-    except Exception as e:
+    except ImportError as e:
         err = f"import {module_name} failed: {e}\n{traceback.format_exc()}"
         errors.append(err)
         logger.debug(err)
@@ -44,36 +45,39 @@ for module_name, attr in candidates:
         if not hasattr(mod, attr):
             logger.info("Module %s does not have attribute %s", module_name, attr)
             continue
-
         obj = getattr(mod, attr)
-
-        # If it's the factory named create_app, call it (no args)
-        if attr == "create_app" and callable(obj):
-            try:
-                logger.info("Calling factory %s.%s()", module_name, attr)
-                maybe_app = obj()
-                if maybe_app:
-                    app = maybe_app
-                    logger.info("Obtained WSGI app from %s.create_app()", module_name)
-                    break
-            except Exception as e:
-                err = f"{module_name}.create_app() raised: {e}\n{traceback.format_exc()}"
-                errors.append(err)
-                logger.exception(err)
-                continue
-
-        else:
-            # If attribute is an 'app' instance or callable app
-            app = obj
-            logger.info("Using attribute %s.%s as WSGI app", module_name, attr)
-            break
-
     except Exception as e:
         err = f"Error while inspecting {module_name}.{attr}: {e}\n{traceback.format_exc()}"
         errors.append(err)
         logger.exception(err)
         continue
 
+    # If it's the factory named create_app, call it (no args)
+    if attr == "create_app" and callable(obj):
+        try:
+            logger.info("Calling factory %s.%s()", module_name, attr)
+            maybe_app = obj()
+        except ImportError as e:
+            err = f"{module_name}.create_app() raised: {e}\n{traceback.format_exc()}"
+            errors.append(err)
+            logger.exception(err)
+            continue
+        except Exception:
+            # The factory was found but failed (bad config, DB, blueprint bug): fail boot
+            # rather than fall back to another candidate and serve a half-configured app
+            logger.exception("%s.create_app() failed", module_name)
+            raise
+        if maybe_app:
+            app = maybe_app
+            logger.info("Obtained WSGI app from %s.create_app()", module_name)
+            break
+
+    else:
+        # If attribute is an 'app' instance or callable app
+        app = obj
+        logger.info("Using attribute %s.%s as WSGI app", module_name, attr)
+        break
+
 if app is None:
     msg_lines = [
         "Could not locate a Flask WSGI 'app' instance or a 'create_app' factory in any of the checked modules.",